@@ -0,0 +1,134 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import pygame
+
+from pgloader import image
+from . import tree
+
+
+def measure(func, repeat: int, setup=None) -> dict[str, float]:
+    times = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return {
+        "min": min(times),
+        "mean": statistics.fmean(times),
+        "max": max(times),
+        "runs": repeat,
+    }
+
+
+def run(root: str, units: list[float], repeat: int, lookups: int, load_options):
+    results, loaders = {}, [None]
+
+    def new_loader():
+        # every load runs on a new loader, so no images, fingerprints or meta
+        # results of a previous run are reused (the OS file cache stays warm)
+        loaders[0] = image.Loader()
+
+    results["load"] = measure(
+        lambda: loaders[0].load(root, units[0], **load_options), repeat, new_loader
+    )
+    loader = loaders[0]
+    results["reload"] = measure(lambda: loader.reload(units[0]), repeat)
+    for unit in units[1:]:
+        results[f"refresh_{units[0]:g}_{unit:g}"] = measure(
+            lambda: (loader.refresh(unit), loader.refresh(units[0])), repeat
+        )
+
+    loader.refresh(units[0])
+    names = sorted(loader._ctx.images)
+    folders = [folder for folder in loader._ctx.folder_images if folder != "sheets"]
+    sheets = sorted(loader._ctx.sheets)
+    results["get"] = measure(
+        lambda: [loader.get(names[i % len(names)]) for i in range(lookups)], repeat
+    )
+    if len(folders) > 0:
+        results["get_all"] = measure(
+            lambda: [loader.get_all(folders[i % len(folders)]) for i in range(lookups)],
+            repeat,
+        )
+    if len(sheets) > 0:
+        results["get_sheet"] = measure(
+            lambda: [loader.get_sheet(sheets[i % len(sheets)]) for i in range(lookups)],
+            repeat,
+        )
+    results["memory"] = loader.get_memory_usage()["total"]
+    return results
+
+
+def main(argv: list[str] = None):
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.run", description="Benchmark pgloader"
+    )
+    parser.add_argument("--output", default="bench_output.json")
+    parser.add_argument("--root", default=None)
+    parser.add_argument("--folders", type=int, default=8)
+    parser.add_argument("--files", type=int, default=32)
+    parser.add_argument("--size", type=int, nargs=2, default=(64, 64))
+    parser.add_argument("--formats", nargs="+", default=["png"])
+    parser.add_argument("--meta-fraction", type=float, default=0.25)
+    parser.add_argument("--sheets", type=int, default=4)
+    parser.add_argument("--sheet-layout", type=int, nargs=2, default=(8, 4))
+    parser.add_argument("--merged", type=int, default=2)
+    parser.add_argument("--units", type=float, nargs="+", default=[16, 32, 48])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--lookups", type=int, default=10000)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--lazy", action="store_true")
+    parser.add_argument("--atlas", action="store_true")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    tree_options = dict(
+        folders=args.folders,
+        files=args.files,
+        size=tuple(args.size),
+        formats=args.formats,
+        meta_fraction=args.meta_fraction,
+        sheets=args.sheets,
+        sheet_layout=tuple(args.sheet_layout),
+        merged=args.merged,
+        seed=args.seed,
+    )
+    load_options = dict(workers=args.workers, lazy=args.lazy, atlas=args.atlas)
+
+    with tempfile.TemporaryDirectory() as temp_root:
+        root = args.root if args.root is not None else temp_root
+        stats = tree.generate(root, **tree_options)
+        results = run(root, args.units, args.repeat, args.lookups, load_options)
+
+    report = {
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "platform": platform.platform(),
+        "tree": tree_options,
+        "generated": stats,
+        "options": {**load_options, "units": args.units, "lookups": args.lookups},
+        "results": results,
+    }
+    with open(args.output, "w") as file:
+        json.dump(report, file, indent=4)
+    for name, result in results.items():
+        if isinstance(result, dict):
+            print(f"{name:>16}: {result['mean'] * 1000:10.3f} ms")
+    print(f"results written to '{args.output}'")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
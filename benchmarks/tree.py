@@ -0,0 +1,92 @@
+import os
+import random
+import pygame
+
+FORMATS = ["png", "bmp", "tga", "jpg"]
+
+
+def write(path: str, text: str):
+    with open(path, "w") as file:
+        file.write(text)
+
+
+def save(path: str, size: tuple[int, int], rng: random.Random):
+    surface = pygame.Surface(size, pygame.SRCALPHA)
+    surface.fill((rng.randrange(256), rng.randrange(256), rng.randrange(256), 255))
+    for _ in range(8):
+        surface.fill(
+            (rng.randrange(256), rng.randrange(256), rng.randrange(256), 128),
+            (
+                rng.randrange(size[0]),
+                rng.randrange(size[1]),
+                rng.randrange(1, size[0] + 1),
+                rng.randrange(1, size[1] + 1),
+            ),
+        )
+    pygame.image.save(surface, path)
+
+
+def generate(
+    root: str,
+    folders: int = 8,
+    files: int = 32,
+    size: tuple[int, int] = (64, 64),
+    formats: list[str] = None,
+    meta_fraction: float = 0.25,
+    sheets: int = 4,
+    sheet_layout: tuple[int, int] = (8, 4),
+    merged: int = 2,
+    seed: int = 0,
+) -> dict[str, int]:
+    rng = random.Random(seed)
+    formats = formats if formats is not None else ["png"]
+    for fmt in formats:
+        if fmt not in FORMATS:
+            raise ValueError(f"Unsupported benchmark format '{fmt}'")
+    os.makedirs(root, exist_ok=True)
+    stats = {"folders": 0, "images": 0, "metas": 0, "sheets": 0, "cells": 0}
+
+    for f in range(folders):
+        folder = f"{root}/folder{f}"
+        os.makedirs(folder, exist_ok=True)
+        stats["folders"] += 1
+        if f % 2 == 0:
+            write(
+                f"{folder}/folder_meta.py",
+                "from pgloader import meta\nmeta.default_settings(unit_size=(1, 1))\n",
+            )
+            stats["metas"] += 1
+        for i in range(files):
+            name = f"image{i}"
+            save(f"{folder}/{name}.{formats[i % len(formats)]}", size, rng)
+            stats["images"] += 1
+            if rng.random() < meta_fraction:
+                write(
+                    f"{folder}/{name}_meta.py",
+                    f"from pgloader import meta\nmeta.settings(scale={rng.choice([0.5, 1.5, 2])}, smoothscale={rng.random() < 0.5})\n",
+                )
+                stats["metas"] += 1
+        if f < merged:
+            write(f"{folder}/register_parent.meta", f"merge{f}")
+            os.makedirs(f"{folder}/merged", exist_ok=True)
+            write(f"{folder}/merged/folder_parent.meta", f"merge{f}")
+            for i in range(files // 4):
+                save(f"{folder}/merged/merged{i}.png", size, rng)
+                stats["images"] += 1
+
+    if sheets > 0:
+        folder = f"{root}/sheets"
+        os.makedirs(folder, exist_ok=True)
+        stats["folders"] += 1
+        columns, rows = sheet_layout
+        for i in range(sheets):
+            name = f"sheet{i}"
+            save(f"{folder}/{name}.png", (size[0] * columns, size[1] * rows), rng)
+            write(
+                f"{folder}/{name}_meta.py",
+                f"from pgloader import meta\nmeta.default_settings(unit_size=(1, 1))\nmeta.sheet_settings(rows={rows}, columns={columns})\n",
+            )
+            stats["sheets"] += 1
+            stats["cells"] += rows * columns
+            stats["metas"] += 1
+    return stats
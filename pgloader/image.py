@@ -1,28 +1,80 @@
 import pygame
 import os
 import string
+import math
 import warnings
 import typing
+import dataclasses
+import hashlib
+import struct
+import mmap
+import threading
+import queue
+import time
+import weakref
+import collections
+import concurrent.futures
+import io
+import multiprocessing
+from multiprocessing import shared_memory, resource_tracker
+import json
+import re
+import ctypes
+import ctypes.util
+import sys
 from . import meta as pgloadermeta
 
 __all__ = (
     "LoadError",
+    "Loader",
     "Image",
+    "FolderView",
+    "SheetView",
     "register_refresh",
+    "register_stats",
+    "set_stats",
+    "get_stats",
+    "reset_stats",
+    "watch",
+    "unwatch",
+    "poll",
+    "write_manifest",
+    "shutdown_processes",
+    "pack",
     "get",
     "gets",
     "get_from",
     "get_all",
     "get_sheet",
+    "get_sheet_frames",
+    "get_folder_view",
+    "get_sheet_view",
+    "get_handle",
+    "get_by_handle",
     "exists",
     "exists_folder",
     "exists_sheet",
     "sheet_has",
     "set_unit",
     "get_unit",
+    "set_scale_cache_size",
+    "LoadHandle",
     "load",
+    "load_async",
+    "preload",
+    "evict",
+    "set_memory_budget",
+    "get_memory_usage",
     "reload",
+    "reload_async",
     "refresh",
+    "request_refresh",
+    "pump_refresh",
+    "set_streamable",
+    "load_folder",
+    "unload_folder",
+    "get_atlas_stats",
+    "clear_meta_cache",
     "default_settings",
     "pygame",
 )
@@ -31,20 +83,12 @@ __all__ = (
 class LoadError(RuntimeError): ...
 
 
-class _ctx:
-    unit = None
-    load_folder = None
-    folders = []
-    images = {}
-    folder_images = {}
-    sheets = {}
-    default_settings = None
-    refresh_callbacks = []
-    meta_storage = pgloadermeta._meta.__META_STORAGE__
-
+class _Context:
     FOLDER_META_FILENAME = "folder_meta.py"
     FOLDER_PARENT_FILENAME = "folder_parent.meta"
     REGISTER_PARENT_FILENAME = "register_parent.meta"
+    ATLAS_MAX_SIZE = 2048
+    MANIFEST_VERSION = 1
     SUPPORTED_FORMATS = [
         "png",
         "jpg",
@@ -64,6 +108,67 @@ class _ctx:
         "webp",
         "xpm",
     ]
+    PROCESS_FORMATS = ["svg", "tif", "tiff", "webp"]
+    SVG_CACHE_SIZE = 4
+    SVG_TAG_PATTERN = re.compile(rb"<svg\b[^>]*>")
+    SVG_SIZE_PATTERN = re.compile(
+        rb"\s(width|height)\s*=\s*[\"']\s*(\d+)(?:px)?\s*[\"']"
+    )
+    SPARSE_ALPHA = 0.5
+
+    def __init__(self, loader):
+        self.loader = loader
+        self.unit = None
+        self.load_folder = None
+        self.workers = None
+        self.hash_files = False
+        self.lazy = False
+        self.cache_dir = None
+        self.cache_size = 512 * 1024 * 1024
+        self.disk_cache = None
+        self.atlas = False
+        self.manifest = None
+        self.pack = None
+        self.processes = None
+        self.process_pool = None
+        self.process_pool_size = None
+        self.scale_cache = collections.OrderedDict()
+        self.scale_cache_size = 0
+        self.dedup = False
+        self.dedup_surfaces = weakref.WeakValueDictionary()
+        self.scale_cache_bytes = 0
+        self.memory_budget = None
+        self.drop_raw = False
+        self.memory_usage = collections.OrderedDict()
+        self.memory_bytes = 0
+        self.folders = []
+        self.all_folders = []
+        self.streamable = set()
+        self.images = {}
+        self.folder_images = {}
+        self.sheets = {}
+        self.sheet_frames = {}
+        self.views_version = 0
+        self.folder_views = {}
+        self.sheet_views = {}
+        self.handle_ids = {}
+        self.handle_names = []
+        self.handle_images = []
+        self.handle_version = None
+        self.loaded_names = set()
+        self.loaded_sheets = set()
+        self.loaded_folders = set()
+        self.default_settings = None
+        self.refresh_callbacks = []
+        self.refresh_jobs = None
+        self.refresh_dirty = False
+        self.refresh_states = None
+        self.use_clock = 0
+        self.stats = None
+        self.stats_callbacks = []
+        self.watcher = None
+        self.meta_storage = pgloadermeta._meta._MetaStorage()
+        self.meta_cache = {}
 
     @staticmethod
     def validate_parent_id(ID):
@@ -79,21 +184,1416 @@ class _ctx:
         with open(path, "r") as file:
             return file.read()
 
+    def check_file(self, path, fingerprint):
+        if self.pack is not None and self.is_relative_to(path, self.pack.root):
+            return self.pack.check_file(path, fingerprint)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return True, None
+        new_fingerprint = (stat.st_mtime_ns, stat.st_size, None)
+        if fingerprint is not None and fingerprint[:2] == new_fingerprint[:2]:
+            return False, fingerprint
+        if self.hash_files:
+            with open(path, "rb") as file:
+                digest = hashlib.blake2b(file.read()).digest()
+            new_fingerprint = (stat.st_mtime_ns, stat.st_size, digest)
+            if fingerprint is not None and fingerprint[2] == digest:
+                return False, new_fingerprint
+        return True, new_fingerprint
+
+    def start_load(
+        self,
+        folder,
+        unit,
+        workers,
+        hash_files,
+        lazy,
+        cache_dir,
+        cache_size,
+        atlas,
+        manifest,
+        processes,
+        dedup,
+    ):
+        if unit is not None:
+            self.loader.set_unit(unit)
+        if self.unit is None:
+            raise LoadError("Unit was not set")
+        if not os.path.exists(folder):
+            raise LoadError("Folder does not exist")
+        if workers is not None and workers < 1:
+            raise LoadError("Workers must be at least 1")
+        if processes is not None and processes < 1:
+            raise LoadError("Processes must be at least 1")
+        if manifest is not None and not os.path.exists(manifest):
+            raise LoadError("Manifest does not exist")
+        pack = None
+        if os.path.isfile(folder):
+            if manifest is not None or cache_dir is not None:
+                raise LoadError("Packs can't be loaded with a manifest or a cache_dir")
+            pack = self.Pack(folder)
+        if folder == self.load_folder:
+            previous_assets = {
+                asset.asset_path: asset
+                for old_folder in self.all_folders
+                for asset in old_folder.asset_pairs
+            }
+            previous_folders = {
+                old_folder.folder_path: old_folder for old_folder in self.all_folders
+            }
+        else:
+            previous_assets, previous_folders = {}, {}
+            self.loaded_names = set()
+            self.loaded_sheets = set()
+            self.loaded_folders = set()
+        self.load_folder = folder
+        self.workers = workers
+        self.hash_files = hash_files
+        self.lazy = lazy
+        self.cache_dir, self.cache_size = cache_dir, cache_size
+        self.atlas = atlas
+        self.manifest = manifest
+        self.processes = processes
+        self.dedup = dedup
+        self.pack = pack
+        self.disk_cache = None
+        if cache_dir is not None:
+            self.disk_cache = self.DiskCache(cache_dir.replace("\\", "/"), cache_size)
+        self.meta_storage.reset()
+        self.refresh_jobs, self.refresh_states = None, None
+        return previous_assets, previous_folders
+
+    def scan_folder(self, folder):
+        listing, stack = [], [folder]
+        if any(
+            name.endswith("_ignore") for name in folder.replace("\\", "/").split("/")
+        ):
+            return listing
+        while len(stack) > 0:
+            dir_path = stack.pop()
+            dir_files, dir_subfolders = [], []
+            try:
+                with os.scandir(dir_path) as entries:
+                    for entry in entries:
+                        if entry.is_dir():
+                            if (
+                                not entry.name.endswith("_ignore")
+                                and not entry.is_symlink()
+                            ):
+                                dir_subfolders.append(
+                                    os.path.join(dir_path, entry.name)
+                                )
+                        elif self.is_load_file(entry.name):
+                            dir_files.append(entry.name)
+            except OSError:
+                continue
+            parent_ids = {
+                file_name: self.read_file(f"{dir_path}/{file_name}")
+                for file_name in (
+                    self.REGISTER_PARENT_FILENAME,
+                    self.FOLDER_PARENT_FILENAME,
+                )
+                if file_name in dir_files
+            }
+            listing.append((dir_path.replace("\\", "/"), dir_files, parent_ids))
+            stack.extend(reversed(dir_subfolders))
+        return listing
+
+    def read_manifest(self, path):
+        try:
+            manifest = json.loads(self.read_file(path))
+        except (OSError, ValueError) as e:
+            raise LoadError(f"Manifest '{path}' could not be read: {e}")
+        if manifest.get("version", None) != self.MANIFEST_VERSION:
+            raise LoadError(f"Manifest '{path}' has an unsupported version")
+        return self.get_listing(manifest["folders"], self.load_folder)
+
+    @staticmethod
+    def get_listing(folders, root):
+        return [
+            (
+                (os.path.join(root, rel_path) if rel_path != "" else root).replace(
+                    "\\", "/"
+                ),
+                dir_files,
+                parent_ids,
+            )
+            for rel_path, dir_files, parent_ids in folders
+        ]
+
+    def get_load_listing(self):
+        if self.pack is not None:
+            return self.get_listing(self.pack.folders, self.pack.root)
+        if self.manifest is not None:
+            return self.read_manifest(self.manifest)
+        return self.scan_folder(self.load_folder)
+
+    def prepare_load(self, previous_assets):
+        # runs on the loading thread: only reads files, the registries are
+        # written by scan_load on the main thread
+        start = self.now()
+        listing = self.get_load_listing()
+        self.record("scan", start)
+        checks = {}
+        for dir_path, dir_files, _ in listing:
+            folder_name = dir_path.split("/")[-1]
+            file_names = set(dir_files)
+            meta_paths = []
+            if (
+                self.FOLDER_META_FILENAME in file_names
+                and self.FOLDER_PARENT_FILENAME not in file_names
+            ):
+                meta_paths.append((f"{dir_path}/{self.FOLDER_META_FILENAME}", "folder"))
+            for file_name in dir_files:
+                name, _, ext = file_name.rpartition(".")
+                if ext.lower() not in self.SUPPORTED_FORMATS:
+                    continue
+                asset_path = f"{dir_path}/{file_name}"
+                asset = previous_assets.get(asset_path, None)
+                checks[asset_path] = self.check_file(
+                    asset_path, asset.fingerprint if asset is not None else None
+                )
+                if f"{name}_meta.py" in file_names:
+                    meta_paths.append((f"{dir_path}/{name}_meta.py", "asset"))
+            for meta_path, type_ in meta_paths:
+                start = self.now()
+                self.run_meta(meta_path, type_)
+                self.record("meta", start, folder=folder_name)
+        return listing, checks
+
+    def scan_load(self, previous_assets, previous_folders, prepared=None):
+        start = self.now()
+        parent_folders = {}
+        pending_folders = []
+        if prepared is None:
+            listing, checks = self.get_load_listing(), {}
+        else:
+            listing, checks = prepared
+        for dir_path, dir_files, parent_ids in listing:
+            asset_pairs = []
+            has_meta = False
+            registered_id = None
+            parent_id = None
+            folder_name = dir_path.split("/")[-1]
+            file_names = set(dir_files)
+
+            for file_name in dir_files:
+                if file_name == self.FOLDER_META_FILENAME:
+                    has_meta = True
+                elif file_name == self.REGISTER_PARENT_FILENAME:
+                    registered_id = parent_ids[file_name]
+                    if registered_id in parent_folders:
+                        raise LoadError(
+                            f"Parent ID '{registered_id}' was already registered by folder '{parent_folders[registered_id].folder_path}'"
+                        )
+                    self.validate_parent_id(registered_id)
+                elif file_name == self.FOLDER_PARENT_FILENAME:
+                    parent_id = parent_ids[file_name]
+                    if parent_id not in parent_folders:
+                        raise LoadError(
+                            f"Folder '{dir_path}' can't have parent with ID '{parent_id}' as it does not exist. Did you register the ID in a subfolder of this one?"
+                        )
+                    self.validate_parent_id(parent_id)
+                else:
+                    name, _, ext = file_name.rpartition(".")
+                    ext = ext.lower()
+                    if ext == "py" and name.endswith("_meta"):
+                        continue
+                    if ext in self.SUPPORTED_FORMATS:
+                        asset_meta = f"{name}_meta.py" in file_names
+                        asset_path = f"{dir_path}/{file_name}"
+                        if asset_path in previous_assets:
+                            asset = previous_assets[asset_path]
+                            asset.folder_name, asset.has_meta = folder_name, asset_meta
+                        else:
+                            asset = self.AssetMetaPair(
+                                self, asset_path, name, folder_name, asset_meta
+                            )
+                        asset_pairs.append(asset)
+
+            if has_meta and parent_id is not None:
+                raise LoadError(
+                    f"Folder '{dir_path}' which declares a parent ID can't have a folder meta as it's handled by the parent folder"
+                )
+            if parent_id is not None:
+                parent_dir = parent_folders[parent_id]
+                for ap in asset_pairs:
+                    ap.folder_name = parent_dir.folder_name
+                parent_dir.add_pairs(asset_pairs)
+            else:
+                if dir_path in previous_folders:
+                    asset_folder = previous_folders[dir_path]
+                    asset_folder.has_meta, asset_folder.asset_pairs = (
+                        has_meta,
+                        asset_pairs,
+                    )
+                else:
+                    asset_folder = self.FolderMeta(
+                        self, dir_path, has_meta, asset_pairs
+                    )
+                if registered_id:
+                    parent_folders[registered_id] = asset_folder
+                pending_folders.append(asset_folder)
+
+        self.record("scan", start)
+        self.all_folders = []
+        for folder in pending_folders:
+            if len(folder.asset_pairs) > 0:
+                active = folder.streamed_in or not self.is_streamable(
+                    folder.folder_path
+                )
+                if folder.active and not active:
+                    folder.unload()
+                folder.active = active
+                self.all_folders.append(folder)
+        self.folders = [folder for folder in self.all_folders if folder.active]
+
+        pending = []
+        for folder in self.folders:
+            pending.extend(folder.get_pending(checks))
+        return pending
+
+    def get_relative_path(self, path):
+        root = self.pack.root if self.pack is not None else self.load_folder
+        path = os.path.relpath(path, root).replace("\\", "/")
+        return "" if path == "." else path
+
+    @staticmethod
+    def is_relative_to(path, folder):
+        return folder == "" or path == folder or path.startswith(f"{folder}/")
+
+    def is_streamable(self, folder_path):
+        path = self.get_relative_path(folder_path)
+        return any(self.is_relative_to(path, folder) for folder in self.streamable)
+
+    def get_stream_folders(self, paths):
+        if self.load_folder is None:
+            raise LoadError("Cannot stream folders without loading once")
+        folders = []
+        for path in paths:
+            path = path.replace("\\", "/").strip("/")
+            found = False
+            for folder in self.all_folders:
+                if self.is_relative_to(
+                    self.get_relative_path(folder.folder_path), path
+                ) or any(
+                    self.is_relative_to(
+                        self.get_relative_path(os.path.dirname(asset.asset_path)), path
+                    )
+                    for asset in folder.asset_pairs
+                ):
+                    found = True
+                    if folder not in folders:
+                        folders.append(folder)
+            if not found:
+                raise LoadError(f"Folder '{path}' does not exist")
+        return folders
+
+    def finish_load(self):
+        names, sheets, assets = set(), set(), set()
+        for folder in self.folders:
+            for asset in folder.asset_pairs:
+                assets.add(asset)
+                names.update(asset.names)
+                if asset.is_sheet:
+                    sheets.add(f"{asset.folder_name}/{asset.asset_name}")
+        folders = set(folder.folder_name for folder in self.folders)
+        for name in self.loaded_names - names:
+            image = self.images.pop(name, None)
+            if image is not None:
+                # removed before being loaded, its file may not exist anymore
+                image._pending = None
+        for name in self.loaded_sheets - sheets:
+            self.sheets.pop(name, None)
+            self.sheet_frames.pop(name, None)
+        for name in self.loaded_folders - folders:
+            self.folder_images.pop(name, None)
+        self.views_version += 1
+        for asset in list(self.memory_usage.keys()):
+            if asset not in assets:
+                self.untrack_memory(asset)
+        self.loaded_names, self.loaded_sheets, self.loaded_folders = (
+            names,
+            sheets,
+            folders,
+        )
+        if self.atlas:
+            self.pack_atlases()
+
+    def get_load_options(self):
+        return {
+            "workers": self.workers,
+            "hash_files": self.hash_files,
+            "lazy": self.lazy,
+            "cache_dir": self.cache_dir,
+            "cache_size": self.cache_size,
+            "atlas": self.atlas,
+            "manifest": self.manifest,
+            "processes": self.processes,
+            "dedup": self.dedup,
+        }
+
+    def get_process_pool(self):
+        if self.process_pool is None or self.process_pool_size != self.processes:
+            self.loader.shutdown_processes()
+            self.process_pool = concurrent.futures.ProcessPoolExecutor(
+                self.processes, mp_context=multiprocessing.get_context("spawn")
+            )
+            self.process_pool_size = self.processes
+        return self.process_pool
+
+    @staticmethod
+    def read_shared(result):
+        name, size, fmt, colorkey = result
+        memory = shared_memory.SharedMemory(name)
+        try:
+            # copied out so the segment is freed even if the surface outlives it
+            with memory.buf[: size[0] * size[1] * len(fmt)] as view:
+                shared = pygame.image.frombuffer(view, size, fmt)
+                surface = shared.copy()
+                del shared
+        finally:
+            memory.close()
+            memory.unlink()
+        if colorkey is not None:
+            surface.set_colorkey(colorkey)
+        return surface
+
+    @staticmethod
+    def discard_shared(future):
+        if future.cancel():
+            return
+        try:
+            name = future.result()[0]
+        except BaseException:
+            return
+        memory = shared_memory.SharedMemory(name)
+        memory.close()
+        memory.unlink()
+
+    def uses_process_pool(self, pending):
+        # the cache and pack entries are read directly, not decoded again
+        return (
+            self.processes is not None
+            and self.pack is None
+            and self.disk_cache is None
+            and any(asset.uses_processes() for asset, _, _ in pending)
+        )
+
+    def load_assets(self, pending):
+        pool, processes = None, None
+        if self.workers is not None and self.workers > 1 and len(pending) > 1:
+            pool = concurrent.futures.ThreadPoolExecutor(self.workers)
+        if self.uses_process_pool(pending):
+            processes = self.get_process_pool()
+        decoded, shared = [], set()
+        try:
+            for asset, settings, sheet_settings in pending:
+                size = asset.get_decode_size(settings, sheet_settings)
+                if asset.has_raw_surface(settings, size):
+                    decoded.append(None)
+                elif processes is not None and asset.uses_processes():
+                    future = processes.submit(_decode_shared, asset.asset_path, size)
+                    decoded.append(future)
+                    shared.add(future)
+                elif pool is not None:
+                    decoded.append(pool.submit(asset.decode, size))
+                else:
+                    decoded.append(None)
+            for (asset, settings, sheet_settings), future in zip(pending, decoded):
+                if future is None:
+                    asset.load_resolved(settings, sheet_settings, cached=True)
+                elif future in shared:
+                    shared.remove(future)
+                    surface = self.read_shared(future.result())
+                    asset.load_resolved(settings, sheet_settings, surface)
+                else:
+                    asset.load_resolved(settings, sheet_settings, future.result())
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+            for future in shared:
+                self.discard_shared(future)
+            if self.disk_cache is not None:
+                self.disk_cache.trim()
+
+    @staticmethod
+    def get_settings_key(settings: pgloadermeta._meta._MetaSettings):
+        key = []
+        for field in dataclasses.fields(settings):
+            value = getattr(settings, field.name)
+            if isinstance(value, (list, pygame.Color)):
+                value = tuple(value)
+            key.append(value)
+        return tuple(key)
+
+    @staticmethod
+    def get_pixels_key(surface: pygame.Surface):
+        return (
+            surface.size,
+            surface.get_bitsize(),
+            surface.get_flags() & pygame.SRCALPHA,
+            surface.get_colorkey(),
+            hashlib.blake2b(pygame.image.tobytes(surface, "RGBA")).digest(),
+        )
+
+    def get_shared_surface(self, key, surface: pygame.Surface):
+        shared = self.dedup_surfaces.get(key, None)
+        if shared is not None:
+            return shared
+        self.dedup_surfaces[key] = surface
+        return surface
+
+    def store_scaled_image(self, key, raw_surface, image):
+        size = image.get_pitch() * image.height
+        if key in self.scale_cache:
+            self.scale_cache_bytes -= self.scale_cache.pop(key)[2]
+        if size > self.scale_cache_size:
+            return
+        self.scale_cache[key] = (weakref.ref(raw_surface), image, size)
+        self.scale_cache_bytes += size
+        self.trim_scale_cache()
+
+    def trim_scale_cache(self):
+        while self.scale_cache_bytes > self.scale_cache_size:
+            self.scale_cache_bytes -= self.scale_cache.popitem(last=False)[1][2]
+
+    def get_assets(self, names):
+        if len(names) == 0:
+            names = list(self.folder_images.keys())
+        assets = {}
+        for name in names:
+            if name in self.folder_images:
+                keys = [f"{name}/{n}" for n in self.folder_images[name]]
+            elif name in self.images or name in self.sheets:
+                keys = [name]
+            else:
+                raise LoadError(f"'{name}' is not an image, a sheet or a folder")
+            for key in keys:
+                if key in self.sheets:
+                    c, r = self.sheets[key][0]
+                    key = f"{key}({c},{r})"
+                asset = self.images[key]._asset
+                assets[id(asset)] = asset
+        return list(assets.values())
+
+    @staticmethod
+    def get_surface_bytes(surface: pygame.Surface):
+        if surface is None or surface.get_parent() is not None:
+            return 0
+        return surface.get_pitch() * surface.height
+
+    def track_memory(self, asset):
+        if (
+            self.drop_raw
+            and not asset.uses_unit(*asset.state[1:3])
+            and not asset.shares_raw()
+        ):
+            asset.raw_surface, asset.raw_alpha = None, None
+            asset.pyramid, asset.pyramid_source = [], None
+            asset.svg_images = collections.OrderedDict()
+            for name in asset.names:
+                self.images[name].raw_surface = None
+        if self.memory_budget is None:
+            return
+        size = asset.get_memory()
+        self.memory_bytes += size - self.memory_usage.pop(asset, 0)
+        self.memory_usage[asset] = size
+        while self.memory_bytes > self.memory_budget and len(self.memory_usage) > 1:
+            next(iter(self.memory_usage)).evict()
+
+    def untrack_memory(self, asset):
+        self.memory_bytes -= self.memory_usage.pop(asset, 0)
+
+    def pack_atlases(self):
+        for folder in self.folders:
+            folder.pack_atlas()
+
+    def touch(self, image):
+        if image._pending is not None:
+            image._pending.load_pending()
+            if image._pending is not None:
+                raise LoadError(f"Image of {image._pending} could not be loaded")
+        elif self.memory_budget is not None and image._asset in self.memory_usage:
+            self.memory_usage.move_to_end(image._asset)
+        self.use_clock += 1
+        image._used = self.use_clock
+        return image
+
+    def sync_handles(self):
+        if self.handle_version == self.views_version:
+            return
+        self.handle_images = [self.images.get(name, None) for name in self.handle_names]
+        self.handle_version = self.views_version
+
+    def get_states(self, always=False):
+        if not always and not any(changes for _, changes in self.refresh_callbacks):
+            return None
+        return {
+            asset: (asset.state, asset.fingerprint)
+            for folder in self.folders
+            for asset in folder.asset_pairs
+        }, set(self.loaded_names)
+
+    def get_changes(self, previous):
+        if previous is None:
+            return None
+        states, names = previous
+        changes = names ^ self.loaded_names
+        for folder in self.folders:
+            for asset in folder.asset_pairs:
+                if states.get(asset, None) != (asset.state, asset.fingerprint):
+                    changes.update(asset.names)
+        return changes
+
+    def get_refresh_jobs(self):
+        jobs = [job for folder in self.folders for job in folder.get_refresh_jobs()]
+        jobs.sort(
+            key=lambda job: max(
+                (self.images[name]._used for name in job[0].names), default=0
+            )
+        )
+        return jobs
+
+    def run_refresh_callbacks(self, changes):
+        for func, with_changes in self.refresh_callbacks:
+            if with_changes:
+                func(changes)
+            else:
+                func()
+
+    @staticmethod
+    def is_load_file(file_name):
+        if file_name in (
+            _Context.FOLDER_PARENT_FILENAME,
+            _Context.REGISTER_PARENT_FILENAME,
+        ):
+            return True
+        name, _, ext = file_name.rpartition(".")
+        if name.endswith("_ignore"):
+            return False
+        return ext.lower() in _Context.SUPPORTED_FORMATS or (
+            ext == "py" and name.endswith("_meta")
+        )
+
+    def apply_changes(self, paths):
+        known, folders, full = {}, set(), False
+        for folder in self.all_folders:
+            if folder.has_meta:
+                known[f"{folder.folder_path}/{self.FOLDER_META_FILENAME}"] = folder
+            for asset in folder.asset_pairs:
+                known[asset.asset_path] = folder
+                if asset.has_meta:
+                    dir_path = os.path.dirname(asset.asset_path)
+                    known[f"{dir_path}/{asset.asset_name}_meta.py"] = folder
+        for path in paths:
+            if path in known and os.path.isfile(path):
+                folders.add(known[path])
+            else:
+                full = True
+
+        previous = self.get_states(True)
+        if full:
+            self.loader.load(self.load_folder, **self.get_load_options())
+        else:
+            pending = []
+            for folder in folders:
+                if folder.active:
+                    pending.extend(folder.get_pending())
+            self.load_assets(pending)
+            self.finish_load()
+        changes = self.get_changes(previous)
+        if len(changes) > 0:
+            self.run_refresh_callbacks(changes)
+        return changes
+
+    def now(self):
+        return time.perf_counter() if self.stats is not None else None
+
+    def record(self, phase, start, asset=None, folder=None, **amounts):
+        if self.stats is None or start is None:
+            return
+        self.stats.record(phase, time.perf_counter() - start, asset, folder, amounts)
+
+    def run_meta(self, path, type_):
+        fingerprint, result = self.meta_cache.get(path, (None, None))
+        changed, fingerprint = self.check_file(path, fingerprint)
+        if not changed:
+            return result
+        if self.pack is not None and self.is_relative_to(path, self.pack.root):
+            result = self.pack.get_meta(path)
+            self.meta_cache[path] = (fingerprint, result)
+            return result
+        code = compile(self.read_file(path), path, "exec")
+        self.meta_storage.reset()
+        token = pgloadermeta._meta.__META_STORAGE__.set(self.meta_storage)
+        try:
+            exec(code)
+        finally:
+            pgloadermeta._meta.__META_STORAGE__.reset(token)
+        self.meta_storage.validate(type_)
+        result = (
+            self.meta_storage.settings,
+            self.meta_storage.default_settings,
+            self.meta_storage.children_settings,
+            self.meta_storage.sheet_settings,
+        )
+        self.meta_storage.reset()
+        self.meta_cache[path] = (fingerprint, result)
+        return result
+
+    class DiskCache:
+        HEADER = struct.Struct("<4sHqQII4s?4B")
+        MAGIC = b"PGLC"
+        VERSION = 1
+        EXTENSION = ".pgcache"
+
+        def __init__(self, folder, max_size):
+            self.folder, self.max_size = folder, max_size
+            os.makedirs(self.folder, exist_ok=True)
+
+        def get_entry_path(self, asset_path):
+            key = hashlib.blake2b(
+                os.path.abspath(asset_path).encode(), digest_size=16
+            ).hexdigest()
+            return f"{self.folder}/{key}{self.EXTENSION}"
+
+        def load(self, asset):
+            fingerprint = asset.fingerprint
+            if fingerprint is None:
+                stat = os.stat(asset.asset_path)
+                fingerprint = (stat.st_mtime_ns, stat.st_size)
+            entry_path = self.get_entry_path(asset.asset_path)
+            surface = self.read(entry_path, fingerprint[:2])
+            if surface is None:
+                surface = pygame.image.load(asset.asset_path)
+                self.write(entry_path, fingerprint[:2], surface)
+            return surface
+
+        def read(self, entry_path, fingerprint):
+            try:
+                file = open(entry_path, "rb")
+            except OSError:
+                return None
+            with file:
+                header = file.read(self.HEADER.size)
+                if len(header) < self.HEADER.size:
+                    return None
+                magic, version, mtime, size, w, h, fmt, has_colorkey, *colorkey = (
+                    self.HEADER.unpack(header)
+                )
+                fmt = fmt.rstrip(b"\0").decode()
+                if (
+                    magic != self.MAGIC
+                    or version != self.VERSION
+                    or (mtime, size) != fingerprint
+                    or fmt not in ("RGB", "RGBA")
+                    or os.fstat(file.fileno()).st_size
+                    != self.HEADER.size + w * h * len(fmt)
+                ):
+                    return None
+                mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            os.utime(entry_path)
+            surface = pygame.image.frombuffer(
+                memoryview(mapped)[self.HEADER.size :], (w, h), fmt
+            )
+            if has_colorkey:
+                surface.set_colorkey(colorkey)
+            return surface
+
+        def write(self, entry_path, fingerprint, surface: pygame.Surface):
+            fmt = "RGBA" if surface.get_flags() & pygame.SRCALPHA else "RGB"
+            colorkey = surface.get_colorkey()
+            header = self.HEADER.pack(
+                self.MAGIC,
+                self.VERSION,
+                *fingerprint,
+                surface.width,
+                surface.height,
+                fmt.encode(),
+                colorkey is not None,
+                *(colorkey if colorkey is not None else (0, 0, 0, 0)),
+            )
+            temp_path = f"{entry_path}.{threading.get_ident()}.tmp"
+            try:
+                with open(temp_path, "wb") as file:
+                    file.write(header)
+                    file.write(pygame.image.tobytes(surface, fmt))
+                os.replace(temp_path, entry_path)
+            except OSError as e:
+                warnings.warn(f"Could not write cache entry '{entry_path}': {e}")
+
+        def trim(self):
+            entries, total = [], 0
+            with os.scandir(self.folder) as dir_entries:
+                for entry in dir_entries:
+                    if not entry.name.endswith(self.EXTENSION):
+                        continue
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+                    total += stat.st_size
+            entries.sort()
+            for _, size, entry_path in entries:
+                if total <= self.max_size:
+                    break
+                try:
+                    os.remove(entry_path)
+                except OSError:
+                    continue
+                total -= size
+
+    class Pack:
+        HEADER = struct.Struct("<4sHQQ")
+        MAGIC = b"PGLP"
+        VERSION = 1
+        EXTENSION = ".pgpack"
+
+        class Reader:
+            def __init__(self, view):
+                self.view, self.pos = view, 0
+
+            def read(self, size=-1):
+                end = len(self.view)
+                if size is not None and size >= 0:
+                    end = min(self.pos + size, end)
+                data = self.view[self.pos : end].tobytes()
+                self.pos = max(self.pos, end)
+                return data
+
+            def seek(self, offset, whence=0):
+                if whence == 1:
+                    offset += self.pos
+                elif whence == 2:
+                    offset += len(self.view)
+                self.pos = max(offset, 0)
+                return self.pos
+
+            def tell(self):
+                return self.pos
+
+        def __init__(self, path):
+            self.path = path.replace("\\", "/")
+            with open(path, "rb") as file:
+                try:
+                    self.mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+                except ValueError:
+                    raise LoadError(f"Pack '{path}' is empty")
+            try:
+                magic, version, index_offset, index_size = self.HEADER.unpack_from(
+                    self.mmap, 0
+                )
+                if magic != self.MAGIC or version != self.VERSION:
+                    raise ValueError("wrong magic or version")
+                index = json.loads(self.mmap[index_offset : index_offset + index_size])
+                self.root = f"{self.path}/{index['name']}"
+                self.folders, self.entries, self.metas = (
+                    index["folders"],
+                    index["entries"],
+                    index["metas"],
+                )
+            except (struct.error, ValueError, KeyError) as e:
+                self.mmap.close()
+                raise LoadError(f"Pack '{path}' could not be read: {e}")
+
+        def get_relative_path(self, path):
+            return path[len(self.root) + 1 :]
+
+        def check_file(self, path, fingerprint):
+            rel_path = self.get_relative_path(path)
+            if rel_path in self.entries:
+                _, size, digest = self.entries[rel_path]
+            elif rel_path in self.metas:
+                size, digest = 0, self.metas[rel_path][0]
+            else:
+                return True, None
+            new_fingerprint = (0, size, digest)
+            return new_fingerprint != fingerprint, new_fingerprint
+
+        def decode(self, path):
+            rel_path = self.get_relative_path(path)
+            if rel_path not in self.entries:
+                raise LoadError(f"'{rel_path}' is not in pack '{self.path}'")
+            offset, size, _ = self.entries[rel_path]
+            with memoryview(self.mmap)[offset : offset + size] as view:
+                return pygame.image.load(self.Reader(view), rel_path)
+
+        def read(self, path):
+            rel_path = self.get_relative_path(path)
+            if rel_path not in self.entries:
+                raise LoadError(f"'{rel_path}' is not in pack '{self.path}'")
+            offset, size, _ = self.entries[rel_path]
+            return self.mmap[offset : offset + size]
+
+        def get_meta(self, path):
+            rel_path = self.get_relative_path(path)
+            if rel_path not in self.metas:
+                raise LoadError(f"'{rel_path}' is not in pack '{self.path}'")
+            settings, default_settings, children_settings, sheet_settings = self.metas[
+                rel_path
+            ][1]
+            if children_settings is not None:
+                children_settings = {
+                    (
+                        tuple(name) if isinstance(name, list) else name
+                    ): self.decode_settings(cs)
+                    for name, cs in children_settings
+                }
+            if sheet_settings is not None:
+                rows, columns, padding, coordinate_settings = sheet_settings
+                sheet_settings = pgloadermeta._meta._SheetMetaSettings(
+                    rows,
+                    columns,
+                    padding,
+                    {
+                        tuple(pos): self.decode_settings(cs)
+                        for pos, cs in coordinate_settings
+                    },
+                )
+            return (
+                self.decode_settings(settings),
+                self.decode_settings(default_settings),
+                children_settings,
+                sheet_settings,
+            )
+
+        @staticmethod
+        def encode_settings(settings: pgloadermeta._meta._MetaSettings):
+            if settings is None:
+                return None
+            values = []
+            for field in dataclasses.fields(settings):
+                value = getattr(settings, field.name)
+                if isinstance(value, (tuple, list, pygame.Color)):
+                    value = list(value)
+                values.append(value)
+            return values
+
+        @staticmethod
+        def decode_settings(values):
+            if values is None:
+                return None
+            return pgloadermeta._meta._MetaSettings(
+                *[
+                    tuple(value) if isinstance(value, list) else value
+                    for value in values
+                ]
+            )
+
+        @staticmethod
+        def encode_meta(result):
+            settings, default_settings, children_settings, sheet_settings = result
+            encode = _Context.Pack.encode_settings
+            if children_settings is not None:
+                children_settings = [
+                    [list(name) if isinstance(name, tuple) else name, encode(cs)]
+                    for name, cs in children_settings.items()
+                ]
+            if sheet_settings is not None:
+                sheet_settings = [
+                    sheet_settings.rows,
+                    sheet_settings.columns,
+                    sheet_settings.padding,
+                    [
+                        [list(pos), encode(cs)]
+                        for pos, cs in sheet_settings.coordinate_settings.items()
+                    ],
+                ]
+            encoded = [
+                encode(settings),
+                encode(default_settings),
+                children_settings,
+                sheet_settings,
+            ]
+            digest = hashlib.blake2b(
+                json.dumps(encoded).encode(), digest_size=16
+            ).hexdigest()
+            return [digest, encoded]
+
+        @staticmethod
+        def write(ctx, folder, path):
+            folders, entries, metas = [], {}, {}
+            temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            try:
+                with open(temp_path, "wb") as file:
+                    file.write(bytes(_Context.Pack.HEADER.size))
+                    for dir_path, dir_files, parent_ids in ctx.scan_folder(folder):
+                        rel_dir = os.path.relpath(dir_path, folder).replace("\\", "/")
+                        rel_dir = "" if rel_dir == "." else rel_dir
+                        folders.append([rel_dir, dir_files, parent_ids])
+                        for file_name in dir_files:
+                            if file_name in parent_ids:
+                                continue
+                            rel_path = (
+                                f"{rel_dir}/{file_name}" if rel_dir else file_name
+                            )
+                            file_path = f"{dir_path}/{file_name}"
+                            if file_name.endswith("_meta.py"):
+                                type_ = (
+                                    "folder"
+                                    if file_name == _Context.FOLDER_META_FILENAME
+                                    else "asset"
+                                )
+                                metas[rel_path] = _Context.Pack.encode_meta(
+                                    ctx.run_meta(file_path, type_)
+                                )
+                                continue
+                            with open(file_path, "rb") as asset_file:
+                                data = asset_file.read()
+                            entries[rel_path] = [
+                                file.tell(),
+                                len(data),
+                                hashlib.blake2b(data, digest_size=16).hexdigest(),
+                            ]
+                            file.write(data)
+                    index = json.dumps(
+                        {
+                            "name": folder.replace("\\", "/").split("/")[-1],
+                            "folders": folders,
+                            "entries": entries,
+                            "metas": metas,
+                        }
+                    ).encode()
+                    index_offset = file.tell()
+                    file.write(index)
+                    file.seek(0)
+                    file.write(
+                        _Context.Pack.HEADER.pack(
+                            _Context.Pack.MAGIC,
+                            _Context.Pack.VERSION,
+                            index_offset,
+                            len(index),
+                        )
+                    )
+                os.replace(temp_path, path)
+            finally:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+
+    class Inotify:
+        IN_MODIFY, IN_ATTRIB, IN_CLOSE_WRITE = 0x2, 0x4, 0x8
+        IN_MOVED_FROM, IN_MOVED_TO, IN_CREATE, IN_DELETE = 0x40, 0x80, 0x100, 0x200
+        IN_Q_OVERFLOW, IN_IGNORED, IN_ISDIR = 0x4000, 0x8000, 0x40000000
+        MASK = (
+            IN_MODIFY
+            | IN_ATTRIB
+            | IN_CLOSE_WRITE
+            | IN_MOVED_FROM
+            | IN_MOVED_TO
+            | IN_CREATE
+            | IN_DELETE
+        )
+        EVENT = struct.Struct("iIII")
+
+        def __init__(self, libc, fd, folder):
+            self.libc, self.fd, self.folder = libc, fd, folder
+            self.watches = {}
+
+        @staticmethod
+        def create(folder):
+            if not sys.platform.startswith("linux"):
+                return None
+            try:
+                libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+                fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+            except (OSError, AttributeError):
+                return None
+            if fd < 0:
+                return None
+            inotify = _Context.Inotify(libc, fd, folder)
+            try:
+                inotify.add_tree(folder)
+            except OSError:
+                inotify.close()
+                return None
+            return inotify
+
+        def add_tree(self, folder):
+            found, stack = [], [folder]
+            while len(stack) > 0:
+                dir_path = stack.pop()
+                wd = self.libc.inotify_add_watch(
+                    self.fd, os.fsencode(dir_path), self.MASK
+                )
+                if wd < 0:
+                    raise OSError(ctypes.get_errno(), f"Cannot watch '{dir_path}'")
+                self.watches[wd] = dir_path.replace("\\", "/")
+                for entry in os.scandir(dir_path):
+                    if entry.is_dir():
+                        if not entry.name.endswith("_ignore"):
+                            stack.append(os.path.join(dir_path, entry.name))
+                    elif _Context.is_load_file(entry.name):
+                        found.append(f"{self.watches[wd]}/{entry.name}")
+            return found
+
+        def read(self):
+            paths = set()
+            while True:
+                try:
+                    data = os.read(self.fd, 65536)
+                except BlockingIOError:
+                    break
+                offset = 0
+                while offset < len(data):
+                    wd, mask, _, length = self.EVENT.unpack_from(data, offset)
+                    offset += self.EVENT.size
+                    name = os.fsdecode(data[offset : offset + length].rstrip(b"\0"))
+                    offset += length
+                    if mask & self.IN_Q_OVERFLOW:
+                        paths.add(f"{self.folder}/")
+                    if mask & self.IN_IGNORED:
+                        self.watches.pop(wd, None)
+                        continue
+                    if wd not in self.watches or name == "":
+                        continue
+                    path = f"{self.watches[wd]}/{name}"
+                    if mask & self.IN_ISDIR:
+                        if name.endswith("_ignore"):
+                            continue
+                        paths.add(f"{path}/")
+                        if mask & (self.IN_CREATE | self.IN_MOVED_TO):
+                            try:
+                                paths.update(self.add_tree(path))
+                            except OSError:
+                                continue
+                    elif _Context.is_load_file(name):
+                        paths.add(path)
+            return paths
+
+        def close(self):
+            os.close(self.fd)
+
+    class Watcher:
+        def __init__(self, folder, interval, debounce, background):
+            self.folder, self.interval, self.debounce = folder, interval, debounce
+            self.lock = threading.Lock()
+            self.paths, self.last_change, self.last_check = set(), 0, 0
+            self.inotify = _Context.Inotify.create(folder)
+            self.snapshot = self.scan() if self.inotify is None else None
+            self.stop_event = threading.Event()
+            self.thread = None
+            if background:
+                self.thread = threading.Thread(target=self.run, daemon=True)
+                self.thread.start()
+
+        def scan(self):
+            snapshot, stack = {}, [self.folder]
+            while len(stack) > 0:
+                dir_path = stack.pop()
+                try:
+                    entries = list(os.scandir(dir_path))
+                except OSError:
+                    continue
+                folder_path = dir_path.replace("\\", "/")
+                for entry in entries:
+                    try:
+                        if entry.is_dir():
+                            if not entry.name.endswith("_ignore"):
+                                stack.append(os.path.join(dir_path, entry.name))
+                        elif _Context.is_load_file(entry.name):
+                            stat = entry.stat()
+                            snapshot[f"{folder_path}/{entry.name}"] = (
+                                stat.st_mtime_ns,
+                                stat.st_size,
+                            )
+                    except OSError:
+                        continue
+            return snapshot
+
+        def run(self):
+            while not self.stop_event.wait(self.interval):
+                self.check()
+
+        def check(self):
+            self.last_check = time.monotonic()
+            if self.inotify is not None:
+                paths = self.inotify.read()
+            else:
+                snapshot = self.scan()
+                paths = {
+                    path
+                    for path, stat in snapshot.items()
+                    if self.snapshot.get(path, None) != stat
+                }
+                paths.update(self.snapshot.keys() - snapshot.keys())
+                self.snapshot = snapshot
+            if len(paths) > 0:
+                with self.lock:
+                    self.paths.update(paths)
+                    self.last_change = time.monotonic()
+
+        def take(self):
+            if (
+                self.thread is None
+                and time.monotonic() - self.last_check >= self.interval
+            ):
+                self.check()
+            with self.lock:
+                if (
+                    len(self.paths) == 0
+                    or time.monotonic() - self.last_change < self.debounce
+                ):
+                    return None
+                paths, self.paths = self.paths, set()
+            return paths
+
+        def stop(self):
+            self.stop_event.set()
+            if self.thread is not None:
+                self.thread.join()
+            if self.inotify is not None:
+                self.inotify.close()
+
+    class Stats:
+        def __init__(self, ctx, slowest):
+            self._ctx, self.slowest = ctx, slowest
+            self.lock = threading.Lock()
+            self.phases, self.assets, self.folders = {}, {}, {}
+            self.totals = {"file_bytes": 0, "decoded_bytes": 0, "surface_bytes": 0}
+
+        def add(self, entry, phase, seconds):
+            entry[phase] = entry.get(phase, 0) + seconds
+            entry["total"] = entry.get("total", 0) + seconds
+
+        def record(self, phase, seconds, asset, folder, amounts):
+            name = None
+            if asset is not None:
+                name = f"{asset.folder_name}/{asset.asset_name}"
+                folder = asset.folder_name
+            with self.lock:
+                self.phases[phase] = self.phases.get(phase, 0) + seconds
+                if name is not None:
+                    entry = self.assets.setdefault(name, {})
+                    self.add(entry, phase, seconds)
+                    for key, amount in amounts.items():
+                        self.totals[key] += amount - entry.get(key, 0)
+                        entry[key] = amount
+                if folder is not None:
+                    self.add(self.folders.setdefault(folder, {}), phase, seconds)
+            for callback in self._ctx.stats_callbacks:
+                callback(phase, name, folder, seconds)
+
+        def report(self):
+            with self.lock:
+                slowest = sorted(
+                    self.assets.items(), key=lambda item: item[1]["total"], reverse=True
+                )[: self.slowest]
+                return {
+                    "phases": dict(self.phases),
+                    "assets": {
+                        name: dict(entry) for name, entry in self.assets.items()
+                    },
+                    "folders": {
+                        name: dict(entry) for name, entry in self.folders.items()
+                    },
+                    **self.totals,
+                    "slowest": [(name, entry["total"]) for name, entry in slowest],
+                }
+
     class AssetMetaPair:
-        def __init__(self, asset_path, asset_name, folder_name, has_meta):
+        def __init__(self, ctx, asset_path, asset_name, folder_name, has_meta):
+            self._ctx = ctx
             self.asset_path, self.asset_name, self.folder_name, self.has_meta = (
                 asset_path,
                 asset_name,
                 folder_name,
                 has_meta,
             )
+            self.meta_settings = None
+            self.meta_default_settings = None
+            self.meta_sheet_settings = None
+            self.raw_surface, self.raw_alpha, self.raw_key = None, None, None
+            self.raw_sparse, self.raw_size = False, None
+            self.sheet_surface = None
+            self.is_svg = asset_path.rpartition(".")[2].lower() == "svg"
+            self.svg_data, self.svg_images = None, collections.OrderedDict()
+            self.svg_size = None
+            self.pyramid, self.pyramid_source = [], None
+            self.fingerprint = None
+            self.state, self.names, self.is_sheet = None, [], False
+            self.pending = None
+            self.unloaded_images = {}
+
+        def read_meta(self, folder_path):
+            self.meta_settings = None
+            self.meta_default_settings = None
+            self.meta_sheet_settings = None
+            if not self.has_meta:
+                return
+            start = self._ctx.now()
+            settings, default_settings, _, sheet_settings = self._ctx.run_meta(
+                f"{folder_path}/{self.asset_name}_meta.py", "asset"
+            )
+            self._ctx.record("meta", start, self)
+            if settings is None and sheet_settings is None and default_settings is None:
+                raise pgloadermeta.MetaError(
+                    f"Asset meta ({folder_path}) should call meta.settings/meta.default_settings or meta.sheet_settings or both"
+                )
+            self.meta_settings = settings
+            self.meta_default_settings = default_settings
+            self.meta_sheet_settings = sheet_settings
+
+        def resolve(self, current_settings: pgloadermeta._meta._MetaSettings):
+            if not self.has_meta:
+                return current_settings, None
+            if self.meta_settings is not None and self.meta_default_settings is None:
+                current_settings = self.meta_settings.copy().apply_default(
+                    current_settings
+                )
+            if self.meta_default_settings is not None:
+                current_settings = self.meta_default_settings.copy().apply_default(
+                    current_settings
+                )
+            sheet_settings = None
+            if self.meta_sheet_settings is not None:
+                sheet_settings = dataclasses.replace(
+                    self.meta_sheet_settings,
+                    coordinate_settings={
+                        pos: s.copy().apply_default(current_settings)
+                        for pos, s in self.meta_sheet_settings.coordinate_settings.items()
+                    },
+                )
+            return current_settings, sheet_settings
+
+        def needs_load(
+            self,
+            settings: pgloadermeta._meta._MetaSettings,
+            sheet_settings: pgloadermeta._meta._SheetMetaSettings,
+            check=None,
+        ):
+            if check is None:
+                check = self._ctx.check_file(self.asset_path, self.fingerprint)
+            changed, self.fingerprint = check
+            if changed:
+                self.raw_surface, self.raw_alpha = None, None
+                self.pyramid, self.pyramid_source = [], None
+                self.svg_data, self.svg_images = None, collections.OrderedDict()
+                self.svg_size = None
+            state = self.get_state(settings, sheet_settings)
+            if not changed and self.state == state:
+                return False
+            self.state = state
+            return True
+
+        def decode(self, size=None):
+            start = self._ctx.now()
+            if size is not None:
+                img = pygame.image.load_sized_svg(io.BytesIO(self.get_svg_data()), size)
+            elif self._ctx.disk_cache is not None:
+                img = self._ctx.disk_cache.load(self)
+            elif self._ctx.pack is not None:
+                img = self._ctx.pack.decode(self.asset_path)
+            else:
+                img = pygame.image.load(self.asset_path)
+            if start is not None:
+                self._ctx.record(
+                    "decode",
+                    start,
+                    self,
+                    file_bytes=self.fingerprint[1] if self.fingerprint else 0,
+                    decoded_bytes=img.get_pitch() * img.height,
+                )
+            return img
+
+        def uses_processes(self):
+            return (
+                self.asset_path.rpartition(".")[2].lower() in self._ctx.PROCESS_FORMATS
+            )
 
-        def get_raw_surface(self, settings: pgloadermeta._meta._MetaSettings):
+        def get_raw_surface(
+            self, settings: pgloadermeta._meta._MetaSettings, decoded=None, size=None
+        ):
             alpha = settings.alpha if settings.alpha is not None else True
-            img = pygame.image.load(self.asset_path)
-            raw_surface = img.convert_alpha() if alpha else img.convert()
+            img = decoded if decoded is not None else self.decode(size)
+            start = self._ctx.now()
+            self.raw_sparse = False
+            if alpha == "auto":
+                raw_surface = self.get_auto_surface(img)
+            else:
+                raw_surface = img.convert_alpha() if alpha else img.convert()
+            self.raw_key = None
+            if self._ctx.dedup:
+                self.raw_key = self._ctx.get_pixels_key(raw_surface)
+                raw_surface = self._ctx.get_shared_surface(
+                    ("raw", self.raw_key), raw_surface
+                )
+            self._ctx.record("convert", start, self)
+            self.raw_surface, self.raw_alpha, self.raw_size = raw_surface, alpha, size
+            if size is not None:
+                self.svg_images[(size, alpha)] = raw_surface
+                while len(self.svg_images) > self._ctx.SVG_CACHE_SIZE:
+                    self.svg_images.popitem(last=False)
             return raw_surface
 
+        def get_auto_surface(self, img: pygame.Surface):
+            if not img.get_flags() & pygame.SRCALPHA:
+                return img.convert()
+            surface = img.convert_alpha()
+            area = surface.width * surface.height
+            if pygame.mask.from_surface(surface, 254).count() == area:
+                return img.convert()
+            visible = pygame.mask.from_surface(surface, 0).count()
+            self.raw_sparse = visible <= area * self._ctx.SPARSE_ALPHA
+            return surface
+
+        def get_format_image(
+            self,
+            settings: pgloadermeta._meta._MetaSettings,
+            raw_surface: pygame.Surface,
+            image: pygame.Surface,
+        ):
+            if settings.alpha != "auto":
+                return image
+            colorkey = image.get_colorkey()
+            if colorkey is None and not (
+                self.raw_sparse and image.get_flags() & pygame.SRCALPHA
+            ):
+                return image
+            if image is raw_surface:
+                image = raw_surface.subsurface(raw_surface.get_rect())
+            if colorkey is not None:
+                image.set_colorkey(colorkey, pygame.RLEACCEL)
+            else:
+                image.set_alpha(image.get_alpha(), pygame.RLEACCEL)
+            return image
+
+        def get_cached_raw_surface(
+            self, settings: pgloadermeta._meta._MetaSettings, size=None
+        ):
+            alpha = settings.alpha if settings.alpha is not None else True
+            if size is not None and (size, alpha) in self.svg_images:
+                self.svg_images.move_to_end((size, alpha))
+                self.raw_surface = self.svg_images[(size, alpha)]
+                self.raw_alpha, self.raw_size = alpha, size
+            if (
+                self.raw_surface is not None
+                and self.raw_alpha == alpha
+                and self.raw_size == size
+            ):
+                return self.raw_surface
+            return self.get_raw_surface(settings, size=size)
+
+        def has_raw_surface(self, settings: pgloadermeta._meta._MetaSettings, size):
+            if size is None:
+                return self.raw_surface is not None and self.raw_size is None
+            alpha = settings.alpha if settings.alpha is not None else True
+            return (size, alpha) in self.svg_images
+
+        def get_decode_size(
+            self,
+            settings: pgloadermeta._meta._MetaSettings,
+            sheet_settings: pgloadermeta._meta._SheetMetaSettings,
+        ):
+            if not self.is_svg or sheet_settings is not None:
+                return None
+            width, height = self.get_svg_size()
+            sizes = self.get_target_sizes(settings, width, height)
+            if len(sizes) == 0:
+                return width, height
+            # keep the aspect ratio, the exact size is scaled from this raster
+            factor = max(sizes[-1][0] / width, sizes[-1][1] / height)
+            return max(1, round(width * factor)), max(1, round(height * factor))
+
         def get_scale_funcs(self, settings: pgloadermeta._meta._MetaSettings):
             smooth = settings.smoothscale if settings.smoothscale is not None else False
             return (
@@ -117,8 +1617,8 @@ class _ctx:
                 image = scaleby(image, settings.scale)
             if settings.unit_size is not None:
                 w, h = (
-                    _ctx.unit * settings.unit_size[0],
-                    _ctx.unit * settings.unit_size[1],
+                    self._ctx.unit * settings.unit_size[0],
+                    self._ctx.unit * settings.unit_size[1],
                 )
                 image = scale(image, (int(w), int(h)))
 
@@ -128,21 +1628,255 @@ class _ctx:
                 image.set_colorkey(settings.colorkey)
             return image
 
-        def load(self, settings: pgloadermeta._meta._MetaSettings):
-            raw_surface = self.get_raw_surface(settings)
-            image = self.get_image(settings, raw_surface.copy())
+        def transforms(self, settings: pgloadermeta._meta._MetaSettings):
+            return (
+                settings.size is not None
+                or settings.scale is not None
+                or settings.unit_size is not None
+            )
+
+        def shares_raw(self):
+            for name in self.names:
+                surface = self._ctx.images[name].image
+                if self.raw_surface is not None and (
+                    surface is self.raw_surface
+                    or surface.get_parent() is self.raw_surface
+                ):
+                    return True
+            return False
+
+        def get_shared_image(
+            self,
+            settings: pgloadermeta._meta._MetaSettings,
+            raw_surface: pygame.Surface,
+            image: pygame.Surface,
+        ):
+            if not self._ctx.dedup or self.is_svg or image is raw_surface:
+                return image
+            if raw_surface is self.raw_surface and self.raw_key is not None:
+                pixels_key = self.raw_key
+            else:
+                pixels_key = self._ctx.get_pixels_key(raw_surface)
+            key = (
+                "image",
+                pixels_key,
+                self._ctx.get_settings_key(settings),
+                self._ctx.unit if settings.unit_size is not None else None,
+            )
+            return self._ctx.get_shared_surface(key, image)
+
+        def get_scaled_image(
+            self,
+            settings: pgloadermeta._meta._MetaSettings,
+            raw_surface: pygame.Surface,
+            name,
+        ):
+            if self.is_svg and self.raw_size is not None:
+                if raw_surface is self.raw_surface:
+                    return self.get_svg_image(settings, raw_surface)
+            if settings.pyramid and raw_surface is self.raw_surface:
+                image = self.get_pyramid_image(settings, raw_surface)
+                if image is not None:
+                    return image
+            if self._ctx.scale_cache_size <= 0:
+                return self.get_image(settings, raw_surface)
+            key = (
+                name,
+                raw_surface.get_abs_offset(),
+                raw_surface.size,
+                self._ctx.get_settings_key(settings),
+                self._ctx.unit if settings.unit_size is not None else None,
+            )
+            entry = self._ctx.scale_cache.get(key, None)
+            if entry is not None and entry[0]() is self.raw_surface:
+                self._ctx.scale_cache.move_to_end(key)
+                return entry[1]
+            image = self.get_image(settings, raw_surface)
+            self._ctx.store_scaled_image(key, self.raw_surface, image)
+            return image
+
+        def get_target_sizes(
+            self, settings: pgloadermeta._meta._MetaSettings, width, height
+        ):
+            sizes = []
+            if settings.size is not None:
+                sizes.append((int(settings.size[0]), int(settings.size[1])))
+            if settings.scale is not None:
+                w, h = sizes[-1] if sizes else (width, height)
+                scale = settings.scale
+                if not isinstance(scale, (tuple, list)):
+                    scale = (scale, scale)
+                sizes.append((int(w * scale[0]), int(h * scale[1])))
+            if settings.unit_size is not None:
+                sizes.append(
+                    (
+                        int(self._ctx.unit * settings.unit_size[0]),
+                        int(self._ctx.unit * settings.unit_size[1]),
+                    )
+                )
+            return sizes
+
+        def get_sheet_image(
+            self,
+            settings: pgloadermeta._meta._MetaSettings,
+            sheet_settings: pgloadermeta._meta._SheetMetaSettings,
+            raw_surface: pygame.Surface,
+            name,
+            width,
+            height,
+        ):
+            columns, rows = sheet_settings.columns, sheet_settings.rows
+            if (
+                settings.smoothscale
+                or sheet_settings.padding != 0
+                or width * columns != raw_surface.width
+                or height * rows != raw_surface.height
+                or len(sheet_settings.coordinate_settings) >= columns * rows
+            ):
+                return None, None
+            sizes = self.get_target_sizes(settings, width, height)
+            if len(sizes) == 0 or any(w <= 0 or h <= 0 for w, h in sizes):
+                return None, None
+            key = (
+                name,
+                None,
+                raw_surface.size,
+                self._ctx.get_settings_key(settings),
+                self._ctx.unit if settings.unit_size is not None else None,
+            )
+            entry = self._ctx.scale_cache.get(key, None)
+            if entry is not None and entry[0]() is self.raw_surface:
+                self._ctx.scale_cache.move_to_end(key)
+                return entry[1], sizes[-1]
+            image = raw_surface
+            for w, h in sizes:
+                image = pygame.transform.scale(image, (w * columns, h * rows))
+            if self._ctx.scale_cache_size > 0:
+                self._ctx.store_scaled_image(key, self.raw_surface, image)
+            return image, sizes[-1]
+
+        def get_pyramid_image(
+            self, settings: pgloadermeta._meta._MetaSettings, raw_surface
+        ):
+            if not settings.smoothscale:
+                return None
+            sizes = self.get_target_sizes(settings, *raw_surface.size)
+            if len(sizes) == 0 or sizes[-1][0] <= 0 or sizes[-1][1] <= 0:
+                return None
+            size = sizes[-1]
+            if self.pyramid_source is not raw_surface:
+                self.pyramid, level = [], raw_surface
+                while level.width >= 2 and level.height >= 2:
+                    level = pygame.transform.smoothscale(
+                        level, (level.width // 2, level.height // 2)
+                    )
+                    self.pyramid.append(level)
+                self.pyramid_source = raw_surface
+            source = raw_surface
+            for level in self.pyramid:
+                if level.width < size[0] or level.height < size[1]:
+                    break
+                source = level
+            if source is raw_surface:
+                return None
+            image = pygame.transform.smoothscale(source, size)
+            if settings.global_alpha is not None:
+                image.set_alpha(settings.global_alpha)
+            if settings.colorkey is not None:
+                image.set_colorkey(settings.colorkey)
+            return image
+
+        def get_svg_data(self):
+            if self.svg_data is None:
+                if self._ctx.pack is not None:
+                    self.svg_data = self._ctx.pack.read(self.asset_path)
+                else:
+                    with open(self.asset_path, "rb") as file:
+                        self.svg_data = file.read()
+            return self.svg_data
+
+        def get_svg_size(self):
+            if self.svg_size is None:
+                data = self.get_svg_data()
+                tag = self._ctx.SVG_TAG_PATTERN.search(data)
+                sizes = {}
+                if tag is not None:
+                    sizes = dict(self._ctx.SVG_SIZE_PATTERN.findall(tag[0]))
+                if int(sizes.get(b"width", 0)) > 0 and int(sizes.get(b"height", 0)) > 0:
+                    self.svg_size = (int(sizes[b"width"]), int(sizes[b"height"]))
+                else:
+                    # units or viewBox only, let the rasterizer find the size
+                    self.svg_size = pygame.image.load(
+                        io.BytesIO(data), "image.svg"
+                    ).size
+            return self.svg_size
+
+        def get_svg_image(
+            self, settings: pgloadermeta._meta._MetaSettings, raw_surface
+        ):
+            size = self.get_target_sizes(settings, *self.get_svg_size())[-1]
+            size = (max(0, size[0]), max(0, size[1]))
+            if raw_surface.size != size:
+                image = self.get_scale_funcs(settings)[0](raw_surface, size)
+            elif settings.global_alpha is not None or settings.colorkey is not None:
+                image = raw_surface.subsurface(raw_surface.get_rect())
+            else:
+                return raw_surface
+            if settings.global_alpha is not None:
+                image.set_alpha(settings.global_alpha)
+            if settings.colorkey is not None:
+                image.set_colorkey(settings.colorkey)
+            return image
+
+        def new_image(self, name):
+            self._ctx.views_version += 1
+            if name in self.unloaded_images:
+                return self.unloaded_images.pop(name)
+            return Image()
+
+        def unload(self):
+            self._ctx.untrack_memory(self)
+            for name in self.names:
+                if name in self._ctx.images:
+                    image = self._ctx.images.pop(name)
+                    image.__dict__.clear()
+                    image._pending = None
+                    self.unloaded_images[name] = image
+            self.raw_surface, self.raw_alpha = None, None
+            self.sheet_surface = None
+            self.svg_data, self.svg_images = None, collections.OrderedDict()
+            self.pyramid, self.pyramid_source = [], None
+            self.state, self.pending = None, None
+            self._ctx.views_version += 1
+
+        def load(self, settings: pgloadermeta._meta._MetaSettings, raw_surface):
             name = f"{self.folder_name}/{self.asset_name}"
-            if name in _ctx.images:
-                _ctx.images[name].__refresh__(raw_surface, image, settings)
+            if self.transforms(settings):
+                image = self.get_scaled_image(settings, raw_surface, name)
+            elif settings.global_alpha is None and settings.colorkey is None:
+                image = raw_surface
+            else:
+                image = raw_surface.subsurface(raw_surface.get_rect())
+                if settings.global_alpha is not None:
+                    image.set_alpha(settings.global_alpha)
+                if settings.colorkey is not None:
+                    image.set_colorkey(settings.colorkey)
+            image = self.get_shared_image(settings, raw_surface, image)
+            image = self.get_format_image(settings, raw_surface, image)
+            self.names, self.is_sheet = [name], False
+            if name in self._ctx.images:
+                self._ctx.images[name].__refresh__(raw_surface, image, settings)
             else:
-                _ctx.images[name] = Image().__refresh__(raw_surface, image, settings)
+                self._ctx.images[name] = self.new_image(name).__refresh__(
+                    raw_surface, image, settings
+                )
 
         def load_sheet(
             self,
             settings: pgloadermeta._meta._MetaSettings,
             sheet_settings: pgloadermeta._meta._SheetMetaSettings,
+            raw_surface,
         ):
-            raw_surface = self.get_raw_surface(settings)
             main_name = f"{self.folder_name}/{self.asset_name}"
             if (
                 sheet_settings.rows > raw_surface.width
@@ -152,13 +1886,20 @@ class _ctx:
                     f"Sheet '{main_name}' layout has too many rows or columns compared to pixels"
                 )
             sheet_pos = []
+            self.names, self.is_sheet = [], True
             width, height = (
                 raw_surface.width // sheet_settings.columns,
                 raw_surface.height // sheet_settings.rows,
             )
             raw_rect = raw_surface.get_rect()
+            sheet_image, cell_size = self.get_sheet_image(
+                settings, sheet_settings, raw_surface, main_name, width, height
+            )
+            self.sheet_surface = sheet_image
+            frames = []
 
             for r in range(sheet_settings.rows):
+                row = []
                 for c in range(sheet_settings.columns):
                     subsurface_rect = pygame.Rect(
                         c * width + sheet_settings.padding * c,
@@ -174,19 +1915,157 @@ class _ctx:
                     this_settings = settings
                     if pos in sheet_settings.coordinate_settings:
                         this_settings = sheet_settings.coordinate_settings[pos]
-                    image = self.get_image(this_settings, raw_subsurface)
                     this_name = f"{main_name}({c},{r})"
-                    if this_name in _ctx.images:
-                        _ctx.images[this_name].__refresh__(
-                            raw_subsurface, image, this_settings
+                    if sheet_image is not None and this_settings is settings:
+                        image = sheet_image.subsurface(
+                            (c * cell_size[0], r * cell_size[1]), cell_size
                         )
+                        if settings.global_alpha is not None:
+                            image.set_alpha(settings.global_alpha)
+                        if settings.colorkey is not None:
+                            image.set_colorkey(settings.colorkey)
                     else:
-                        _ctx.images[this_name] = Image().__refresh__(
+                        image = self.get_scaled_image(
+                            this_settings, raw_subsurface, this_name
+                        )
+                        image = self.get_shared_image(
+                            this_settings, raw_subsurface, image
+                        )
+                    image = self.get_format_image(this_settings, raw_subsurface, image)
+                    if this_name in self._ctx.images:
+                        self._ctx.images[this_name].__refresh__(
                             raw_subsurface, image, this_settings
                         )
+                    else:
+                        self._ctx.images[this_name] = self.new_image(
+                            this_name
+                        ).__refresh__(raw_subsurface, image, this_settings)
                     sheet_pos.append(pos)
+                    self.names.append(this_name)
+                    row.append(self._ctx.images[this_name])
+                frames.append(row)
 
-            _ctx.sheets[main_name] = sheet_pos
+            self._ctx.sheets[main_name] = sheet_pos
+            self._ctx.sheet_frames[main_name] = frames
+            self._ctx.views_version += 1
+
+        def defer(
+            self,
+            settings: pgloadermeta._meta._MetaSettings,
+            sheet_settings: pgloadermeta._meta._SheetMetaSettings,
+        ):
+            self.pending = (settings, sheet_settings)
+            main_name = f"{self.folder_name}/{self.asset_name}"
+            if sheet_settings is None:
+                self.names, self.is_sheet = [main_name], False
+            else:
+                sheet_pos = [
+                    (c, r)
+                    for r in range(sheet_settings.rows)
+                    for c in range(sheet_settings.columns)
+                ]
+                self.names = [f"{main_name}({c},{r})" for c, r in sheet_pos]
+                self.is_sheet = True
+                self._ctx.sheets[main_name] = sheet_pos
+            for name in self.names:
+                if name in self._ctx.images:
+                    self._ctx.images[name].__defer__(self)
+                else:
+                    self._ctx.images[name] = self.new_image(name).__defer__(self)
+            if self.is_sheet:
+                self._ctx.sheet_frames[main_name] = [
+                    [
+                        self._ctx.images[f"{main_name}({c},{r})"]
+                        for c in range(sheet_settings.columns)
+                    ]
+                    for r in range(sheet_settings.rows)
+                ]
+                self._ctx.views_version += 1
+
+        def load_pending(self):
+            if self.pending is None:
+                return
+            settings, sheet_settings = self.pending
+            self.load_resolved(settings, sheet_settings, cached=True)
+
+        def load_resolved(
+            self,
+            settings: pgloadermeta._meta._MetaSettings,
+            sheet_settings: pgloadermeta._meta._SheetMetaSettings,
+            decoded=None,
+            cached=False,
+        ):
+            size = self.get_decode_size(settings, sheet_settings)
+            if cached:
+                raw_surface = self.get_cached_raw_surface(settings, size)
+            else:
+                raw_surface = self.get_raw_surface(settings, decoded, size)
+            start = self._ctx.now()
+            if sheet_settings is None:
+                self.load(settings, raw_surface)
+            else:
+                self.load_sheet(settings, sheet_settings, raw_surface)
+            # cleared only once loaded, a failed load is tried again on next access
+            self.pending = None
+            if start is not None:
+                self._ctx.record("scale", start, self, surface_bytes=self.get_memory())
+            for name in self.names:
+                self._ctx.images[name]._asset = self
+            if self._ctx.memory_budget is not None or self._ctx.drop_raw:
+                self._ctx.track_memory(self)
+
+        def evict(self):
+            self._ctx.untrack_memory(self)
+            if self.pending is not None or self.state is None:
+                return
+            self.raw_surface, self.raw_alpha = None, None
+            self.sheet_surface = None
+            self.svg_images = collections.OrderedDict()
+            self.pyramid, self.pyramid_source = [], None
+            self.defer(*self.state[1:3])
+
+        def uses_unit(
+            self,
+            settings: pgloadermeta._meta._MetaSettings,
+            sheet_settings: pgloadermeta._meta._SheetMetaSettings,
+        ):
+            return settings.unit_size is not None or (
+                sheet_settings is not None
+                and any(
+                    s.unit_size is not None
+                    for s in sheet_settings.coordinate_settings.values()
+                )
+            )
+
+        def get_state(
+            self,
+            settings: pgloadermeta._meta._MetaSettings,
+            sheet_settings: pgloadermeta._meta._SheetMetaSettings,
+        ):
+            return (
+                self.folder_name,
+                settings,
+                sheet_settings,
+                self._ctx.unit if self.uses_unit(settings, sheet_settings) else None,
+            )
+
+        def get_memory(self):
+            if self.pending is not None:
+                return 0
+            surfaces = {id(self.raw_surface): self.raw_surface}
+            for name in self.names:
+                surface = self._ctx.images[name].image
+                surfaces[id(surface)] = surface
+                if (
+                    self.sheet_surface is not None
+                    and surface.get_parent() is self.sheet_surface
+                ):
+                    surfaces[id(self.sheet_surface)] = self.sheet_surface
+            for surface in [*self.svg_images.values(), *self.pyramid]:
+                surfaces[id(surface)] = surface
+            return sum(
+                self._ctx.get_surface_bytes(surface) for surface in surfaces.values()
+            )
 
         def __str__(self):
             return f"Asset(path={self.asset_path}, name={self.asset_name}, folder={self.folder_name}{", has meta" if self.has_meta else ""})"
@@ -194,45 +2073,54 @@ class _ctx:
         __repr__ = __str__
 
     class FolderMeta:
-        def __init__(self, folder_path, has_meta, asset_pairs):
+        def __init__(self, ctx, folder_path, has_meta, asset_pairs):
+            self._ctx = ctx
             self.folder_path, self.has_meta, self.asset_pairs = (
                 folder_path,
                 has_meta,
                 asset_pairs,
             )
             self.folder_name = self.folder_path.split("/")[-1]
+            self.meta_default_settings, self.meta_children_settings = None, {}
+            self.atlases, self.atlas_stats = [], None
+            self.active, self.streamed_in = True, False
+
+        def read_meta(self):
+            self.meta_default_settings, self.meta_children_settings = None, {}
+            if not self.has_meta:
+                return
+            start = self._ctx.now()
+            settings, default_settings, children_settings, _ = self._ctx.run_meta(
+                f"{self.folder_path}/{self._ctx.FOLDER_META_FILENAME}", "folder"
+            )
+            self._ctx.record("meta", start, folder=self.folder_name)
+            if settings is not None:
+                self.meta_default_settings = settings
+            if default_settings is not None:
+                self.meta_default_settings = default_settings
+            if children_settings is not None:
+                for cname, cs in children_settings.items():
+                    apply_to = []
+                    if isinstance(cname, str):
+                        apply_to = [cname]
+                    else:
+                        apply_to = list(cname)
+                    for n in apply_to:
+                        self.meta_children_settings[n] = cs
 
-        def load(self):
-            if _ctx.default_settings is not None:
-                default_settings = _ctx.default_settings.copy()
+        def resolve(self, read_meta=True):
+            if read_meta:
+                self.read_meta()
+            if self.meta_default_settings is not None:
+                default_settings = self.meta_default_settings.copy()
+            elif self._ctx.default_settings is not None:
+                default_settings = self._ctx.default_settings.copy()
             else:
                 default_settings = pgloadermeta._meta._MetaSettings()
-            children_settings = {}
-            if self.has_meta:
-                content = _ctx.read_file(
-                    f"{self.folder_path}/{_ctx.FOLDER_META_FILENAME}"
-                )
-                exec(content)
-                _ctx.meta_storage.validate("folder")
-                if _ctx.meta_storage.settings is not None:
-                    default_settings = _ctx.meta_storage.settings
-                if _ctx.meta_storage.default_settings is not None:
-                    default_settings = _ctx.meta_storage.default_settings
-                if _ctx.meta_storage.children_settings is not None:
-                    for (
-                        cname,
-                        cs,
-                    ) in _ctx.meta_storage.children_settings.items():
-                        apply_to = []
-                        if isinstance(cname, str):
-                            apply_to = [cname]
-                        else:
-                            apply_to = list(cname)
-                        for n in apply_to:
-                            children_settings[n] = cs
-                _ctx.meta_storage.reset()
+            children_settings = self.meta_children_settings
             to_use_children_settings = list(children_settings.keys())
-            _ctx.folder_images[self.folder_name] = []
+            self._ctx.folder_images[self.folder_name] = []
+            resolved = []
             for asset in self.asset_pairs:
                 child_settings: pgloadermeta._meta._MetaSettings = (
                     children_settings.get(asset.asset_name, None)
@@ -240,50 +2128,138 @@ class _ctx:
                 current_settings = default_settings
                 if child_settings is not None:
                     to_use_children_settings.remove(asset.asset_name)
-                    child_settings.apply_default(default_settings)
-                    current_settings = child_settings
-                sheet_settings = None
-                if asset.has_meta:
-                    content = _ctx.read_file(
-                        f"{self.folder_path}/{asset.asset_name}_meta.py"
+                    current_settings = child_settings.copy().apply_default(
+                        default_settings
                     )
-                    exec(content)
-                    _ctx.meta_storage.validate("asset")
-                    if (
-                        _ctx.meta_storage.settings is None
-                        and _ctx.meta_storage.sheet_settings is None
-                        and _ctx.meta_storage.default_settings is None
-                    ):
-                        raise pgloadermeta.MetaError(
-                            f"Asset meta ({self.folder_path}) should call meta.settings/meta.default_settings or meta.sheet_settings or both"
-                        )
-                    if (
-                        _ctx.meta_storage.settings is not None
-                        and _ctx.meta_storage.default_settings is None
-                    ):
-                        _ctx.meta_storage.settings.apply_default(current_settings)
-                        current_settings = _ctx.meta_storage.settings
-                    if _ctx.meta_storage.default_settings is not None:
-                        _ctx.meta_storage.default_settings.apply_default(
-                            current_settings
-                        )
-                        current_settings = _ctx.meta_storage.default_settings
-                    if _ctx.meta_storage.sheet_settings is not None:
-                        sheet_settings = _ctx.meta_storage.sheet_settings
-                        sheet_settings.coordinate_settings = {
-                            pos: s.apply_default(current_settings)
-                            for pos, s in sheet_settings.coordinate_settings.items()
-                        }
-                    _ctx.meta_storage.reset()
-                if sheet_settings is None:
-                    asset.load(current_settings)
-                else:
-                    asset.load_sheet(current_settings, sheet_settings)
-                _ctx.folder_images[self.folder_name].append(asset.asset_name)
+                if read_meta:
+                    asset.read_meta(self.folder_path)
+                current_settings, sheet_settings = asset.resolve(current_settings)
+                resolved.append((asset, current_settings, sheet_settings))
+                self._ctx.folder_images[self.folder_name].append(asset.asset_name)
+            self._ctx.views_version += 1
             for name in to_use_children_settings:
                 warnings.warn(
                     f"Children settings in '{self.folder_path}' specifies settings for the asset '{name}' which does not exist"
                 )
+            return resolved
+
+        def get_pending(self, checks=None):
+            pending = []
+            for asset, settings, sheet_settings in self.resolve():
+                check = checks.get(asset.asset_path, None) if checks else None
+                if not asset.needs_load(settings, sheet_settings, check):
+                    continue
+                if self._ctx.lazy:
+                    asset.defer(settings, sheet_settings)
+                else:
+                    pending.append((asset, settings, sheet_settings))
+            return pending
+
+        def unload(self):
+            self.active, self.streamed_in = False, False
+            self.atlases, self.atlas_stats = [], None
+            for asset in self.asset_pairs:
+                asset.unload()
+
+        def get_refresh_jobs(self):
+            jobs = []
+            for asset, settings, sheet_settings in self.resolve(False):
+                state = asset.get_state(settings, sheet_settings)
+                if asset.pending is not None:
+                    asset.state = state
+                    asset.defer(settings, sheet_settings)
+                elif state != asset.state:
+                    jobs.append((asset, settings, sheet_settings, state))
+            return jobs
+
+        def refresh(self):
+            for asset, settings, sheet_settings, state in self.get_refresh_jobs():
+                asset.state = state
+                asset.load_resolved(settings, sheet_settings, cached=True)
+
+        def pack_atlas(self):
+            images = [
+                self._ctx.images[name]
+                for asset in self.asset_pairs
+                if asset.pending is None
+                for name in asset.names
+            ]
+            if all(image.image.get_parent() in self.atlases for image in images):
+                return
+            start = self._ctx.now()
+            groups = {}
+            for image in images:
+                surface = image.image
+                if (
+                    surface.width * surface.height == 0
+                    or surface.width > self._ctx.ATLAS_MAX_SIZE
+                    or surface.height > self._ctx.ATLAS_MAX_SIZE
+                ):
+                    continue
+                key = (surface.get_bitsize(), surface.get_flags() & pygame.SRCALPHA)
+                groups.setdefault(key, []).append(image)
+
+            atlases, used_area = [], 0
+            for group in groups.values():
+                group.sort(key=lambda image: image.image.height, reverse=True)
+                area = sum(image.image.width * image.image.height for image in group)
+                width = min(
+                    self._ctx.ATLAS_MAX_SIZE,
+                    max(
+                        max(image.image.width for image in group),
+                        math.ceil(math.sqrt(area)),
+                    ),
+                )
+                bins, placed = [], []
+                x = y = shelf_height = 0
+                for image in group:
+                    w, h = image.image.size
+                    if x + w > width:
+                        x, y, shelf_height = 0, y + shelf_height, 0
+                    if y + h > self._ctx.ATLAS_MAX_SIZE:
+                        bins.append(placed)
+                        placed, x, y, shelf_height = [], 0, 0, 0
+                    placed.append((image, x, y))
+                    x += w
+                    shelf_height = max(shelf_height, h)
+                bins.append(placed)
+
+                for placed in bins:
+                    atlas = pygame.Surface(
+                        (
+                            max(x + image.image.width for image, x, _ in placed),
+                            max(y + image.image.height for image, _, y in placed),
+                        ),
+                        placed[0][0].image.get_flags() & pygame.SRCALPHA,
+                        placed[0][0].image,
+                    )
+                    for image, x, y in placed:
+                        surface = image.image
+                        colorkey, alpha = surface.get_colorkey(), surface.get_alpha()
+                        surface.set_colorkey(None)
+                        surface.set_alpha(None)
+                        atlas.blit(surface, (x, y))
+                        surface.set_colorkey(colorkey)
+                        surface.set_alpha(alpha)
+                        subsurface = atlas.subsurface((x, y), surface.size)
+                        subsurface.set_colorkey(colorkey)
+                        subsurface.set_alpha(alpha)
+                        image.__refresh__(
+                            image.raw_surface, subsurface, image.load_settings
+                        )
+                        used_area += surface.width * surface.height
+                    atlases.append(atlas)
+
+            self.atlases = atlases
+            total_area = sum(atlas.width * atlas.height for atlas in atlases)
+            self.atlas_stats = {
+                "atlases": len(atlases),
+                "images": len(images),
+                "packed_images": sum(len(group) for group in groups.values()),
+                "bytes": sum(atlas.get_pitch() * atlas.height for atlas in atlases),
+                "efficiency": used_area / total_area if total_area > 0 else 1.0,
+            }
+            self._ctx.record("atlas", start, folder=self.folder_name)
 
         def add_pairs(self, asset_pairs):
             self.asset_pairs.extend(asset_pairs)
@@ -300,7 +2276,12 @@ class _ctx:
 
 
 class Image:
+    _pending = None
+    _asset = None
+    _used = 0
+
     def __refresh__(self, raw_surface, image, load_settings):
+        self._pending = None
         self.raw_surface: pygame.Surface = raw_surface
         self.image: pygame.Surface = image
         self.load_settings: pgloadermeta._meta._MetaSettings = load_settings
@@ -309,186 +2290,730 @@ class Image:
         self.width: int = self.image.width
         self.height: int = self.image.height
         self.size: tuple[int, int] = self.image.size
+        flags = self.image.get_flags()
+        self.format: str = (
+            "alpha"
+            if flags & pygame.SRCALPHA
+            else "colorkey" if self.image.get_colorkey() is not None else "opaque"
+        )
+        self.rle: bool = bool(flags & (pygame.RLEACCEL | pygame.RLEACCELOK))
         return self
 
+    def __defer__(self, asset):
+        self.__dict__.clear()
+        self._pending = self._asset = asset
+        return self
 
-def register_refresh(callback: typing.Callable):
-    _ctx.refresh_callbacks.append(callback)
+    def __getattr__(self, name):
+        if self._pending is None:
+            raise AttributeError(
+                f"'{type(self).__name__}' object has no attribute '{name}'"
+            )
+        self._pending.load_pending()
+        if self._pending is not None:
+            raise LoadError(f"Image of {self._pending} could not be loaded")
+        return getattr(self, name)
 
 
-def get(name: str, default=RuntimeError) -> Image:
-    if name in _ctx.images:
-        return _ctx.images[name]
-    if isinstance(default, type) and issubclass(default, Exception):
-        raise default(f"Image '{name}' does not exist")
-    return default
+def _decode_shared(path, size=None):
+    if size is not None:
+        surface = pygame.image.load_sized_svg(path, size)
+    else:
+        surface = pygame.image.load(path)
+    fmt = "RGBA" if surface.get_flags() & pygame.SRCALPHA else "RGB"
+    colorkey = surface.get_colorkey()
+    data = pygame.image.tobytes(surface, fmt)
+    memory = shared_memory.SharedMemory(create=True, size=max(len(data), 1))
+    memory.buf[: len(data)] = data
+    # the main process unlinks the memory once the surface is converted
+    resource_tracker.unregister(memory._name, "shared_memory")
+    memory.close()
+    return memory.name, surface.size, fmt, colorkey
 
 
-def gets(*names: str, default=RuntimeError) -> list[Image]:
-    return [get(name, default) for name in names]
+class SheetView:
+    def __init__(self, ctx: _Context, name: str):
+        self._ctx = ctx
+        self.name: str = name
+        self._frames: list[tuple[Image, ...]] = []
+        self._version = None
 
+    def _sync(self):
+        if self._version != self._ctx.views_version:
+            self._frames = [
+                tuple(row) for row in self._ctx.sheet_frames.get(self.name, [])
+            ]
+            self._version = self._ctx.views_version
+        return self._frames
 
-def get_from(folder: str, *names: str, default=RuntimeError) -> list[Image]:
-    return [get(f"{folder}/{name}", default) for name in names]
+    @property
+    def rows(self) -> int:
+        return len(self._sync())
 
+    @property
+    def columns(self) -> int:
+        frames = self._sync()
+        return len(frames[0]) if len(frames) > 0 else 0
 
-def get_all(folder: str, default=RuntimeError) -> list[Image]:
-    if folder in _ctx.folder_images:
-        return [get(f"{folder}/{name}", default) for name in _ctx.folder_images[folder]]
-    if isinstance(default, type) and issubclass(default, Exception):
-        raise default(f"Folder '{folder}' does not exist")
-    return default
+    def __len__(self) -> int:
+        return len(self._sync())
 
+    def __iter__(self) -> typing.Iterator[tuple[Image, ...]]:
+        for r in range(len(self._sync())):
+            yield self[r]
 
-def get_sheet(name: str, default=RuntimeError) -> dict[tuple[int, int], Image]:
-    if name in _ctx.sheets:
-        return {
-            pos: get(f"{name}({pos[0]},{pos[1]})", default) for pos in _ctx.sheets[name]
-        }
-    if isinstance(default, type) and issubclass(default, Exception):
-        raise default(f"Sheet '{name}' does not exist")
-    return default
+    def __contains__(self, pos: tuple[int, int]) -> bool:
+        frames = self._sync()
+        return 0 <= pos[1] < len(frames) and 0 <= pos[0] < len(frames[pos[1]])
 
+    def __getitem__(self, key: int | tuple[int, int]) -> Image | tuple[Image, ...]:
+        frames = self._sync()
+        if isinstance(key, tuple):
+            return self._ctx.touch(frames[key[1]][key[0]])
+        row = frames[key]
+        if len(row) > 0:
+            self._ctx.touch(row[0])
+        return row
 
-def exists(*names: str) -> bool:
-    return all([name in _ctx.images for name in names])
+    def __repr__(self):
+        return f"SheetView(name={self.name}, rows={self.rows}, columns={self.columns})"
 
 
-def exists_folder(*folders: str) -> bool:
-    return all([name in _ctx.folder_images for name in folders])
+class FolderView:
+    def __init__(self, ctx: _Context, folder: str):
+        self._ctx = ctx
+        self.folder: str = folder
+        self._items: list[Image | SheetView] = []
+        self._index: dict[str, int] = {}
+        self._version = None
 
+    def _sync(self):
+        if self._version != self._ctx.views_version:
+            items, index = [], {}
+            for name in self._ctx.folder_images.get(self.folder, []):
+                full_name = f"{self.folder}/{name}"
+                if full_name in self._ctx.images:
+                    item = self._ctx.images[full_name]
+                elif full_name in self._ctx.sheet_frames:
+                    item = self._ctx.loader.get_sheet_view(full_name)
+                else:
+                    continue
+                index[name] = len(items)
+                items.append(item)
+            self._items, self._index, self._version = (
+                items,
+                index,
+                self._ctx.views_version,
+            )
+        return self._items
 
-def exists_sheet(*sheets: str) -> bool:
-    return all([name in _ctx.sheets for name in sheets])
+    @property
+    def names(self) -> list[str]:
+        self._sync()
+        return list(self._index.keys())
 
+    def __len__(self) -> int:
+        return len(self._sync())
 
-def sheet_has(sheet: str, *coordinates: tuple[int, int]):
-    return exists_sheet(sheet) and all(
-        [exists(f"{sheet}({c[0]},{c[1]})") for c in coordinates]
-    )
+    def __iter__(self) -> typing.Iterator[Image | SheetView]:
+        for i in range(len(self._sync())):
+            yield self[i]
 
+    def __contains__(self, name: str) -> bool:
+        self._sync()
+        return name in self._index
 
-def set_unit(unit: float):
-    unit = float(unit)
-    _ctx.unit = unit
+    def __getitem__(self, key: int | str) -> Image | SheetView:
+        items = self._sync()
+        item = items[self._index[key] if isinstance(key, str) else key]
+        return self._ctx.touch(item) if isinstance(item, Image) else item
 
+    def __repr__(self):
+        return f"FolderView(folder={self.folder}, images={len(self)})"
 
-def get_unit() -> float:
-    if _ctx.unit is None:
-        raise LoadError("Unit was not set")
-    return _ctx.unit
 
+class LoadHandle:
+    QUEUE_SIZE = 64
 
-def default_settings(
-    alpha: bool = None,
-    size: tuple[int, int] = None,
-    scale: float | tuple[float, float] = None,
-    unit_size: tuple[float, float] = None,
-    colorkey: str | list[int] | int | pygame.Color = None,
-    global_alpha: int = None,
-    smoothscale: bool = None,
-):
-    _ctx.default_settings = pgloadermeta._meta._MetaSettings(
-        alpha, size, scale, unit_size, colorkey, global_alpha, smoothscale
-    )
+    def __init__(self, ctx: _Context, previous, refresh=False, states=None):
+        self._ctx = ctx
+        self.total: int = None
+        self.loaded: int = 0
+        self.total_bytes: int = 0
+        self.loaded_bytes: int = 0
+        self.last_loaded: str = None
+        self._refresh, self._states = refresh, states
+        self._previous = previous
+        self._queue = queue.Queue(LoadHandle.QUEUE_SIZE)
+        self._jobs = queue.Queue()
+        self._processes = None
+        self._error = None
+        self._finished = False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
 
-
-def load(folder: str, unit: float = None):
-    if unit is not None:
-        set_unit(unit)
-    if _ctx.unit is None:
-        raise LoadError("Unit was not set")
-    if not os.path.exists(folder):
-        raise LoadError("Folder does not exist")
-    _ctx.load_folder = folder
-    _ctx.meta_storage.reset()
-
-    parent_folders = {}
-    pending_folders = []
-    for dir_path, dir_subfolders, dir_files in os.walk(_ctx.load_folder):
-        dir_path = dir_path.replace("\\", "/")
-        asset_pairs = []
-        has_meta = False
-        registered_id = None
-        parent_id = None
-        folder_name = dir_path.split("/")[-1]
-        if any([name.endswith("_ignore") for name in dir_path.split("/")]):
-            continue
-
-        for file_name in dir_files:
-            if file_name == _ctx.FOLDER_META_FILENAME:
-                has_meta = True
-            elif file_name == _ctx.REGISTER_PARENT_FILENAME:
-                registered_id = _ctx.read_file(f"{dir_path}/{file_name}")
-                if registered_id in parent_folders:
-                    raise LoadError(
-                        f"Parent ID '{registered_id}' was already registered by folder '{parent_folders[registered_id].folder_path}'"
-                    )
-                _ctx.validate_parent_id(registered_id)
-            elif file_name == _ctx.FOLDER_PARENT_FILENAME:
-                parent_id = _ctx.read_file(f"{dir_path}/{file_name}")
-                if parent_id not in parent_folders:
-                    raise LoadError(
-                        f"Folder '{dir_path}' can't have parent with ID '{parent_id}' as it does not exist. Did you register the ID in a subfolder of this one?"
-                    )
-                _ctx.validate_parent_id(parent_id)
-            else:
-                name, ext = file_name.split(".")
-                ext = ext.lower()
-                if name.endswith("_ignore"):
-                    continue
-                if ext == "py" and name.endswith("_meta"):
-                    continue
-                if ext in _ctx.SUPPORTED_FORMATS:
-                    asset_meta = False
-                    if os.path.exists(f"{dir_path}/{name}_meta.py"):
-                        asset_meta = True
-                    asset_pairs.append(
-                        _ctx.AssetMetaPair(
-                            f"{dir_path}/{file_name}", name, folder_name, asset_meta
-                        )
+    def _run(self):
+        pool, shared = None, set()
+        try:
+            self._queue.put(self._ctx.prepare_load(self._previous[0]))
+            jobs = self._jobs.get()
+            if jobs is None:
+                return
+            if self._ctx.workers is not None and self._ctx.workers > 1:
+                pool = concurrent.futures.ThreadPoolExecutor(self._ctx.workers)
+            decoded = []
+            for (asset, _, _), size, decode in jobs:
+                if not decode:
+                    decoded.append(None)
+                elif self._processes is not None and asset.uses_processes():
+                    future = self._processes.submit(
+                        _decode_shared, asset.asset_path, size
                     )
+                    decoded.append(future)
+                    shared.add(future)
+                elif pool is not None:
+                    decoded.append(pool.submit(asset.decode, size))
+                else:
+                    decoded.append(None)
+            for (job, size, decode), future in zip(jobs, decoded):
+                if future in shared:
+                    shared.remove(future)
+                    self._queue.put((job, self._ctx.read_shared(future.result())))
+                elif future is not None:
+                    self._queue.put((job, future.result()))
+                elif decode:
+                    self._queue.put((job, job[0].decode(size)))
+                else:
+                    self._queue.put((job, None))
+        except BaseException as e:
+            self._error = e
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+            for future in shared:
+                self._ctx.discard_shared(future)
+            self._queue.put(None)
 
-        if has_meta and parent_id is not None:
-            raise LoadError(
-                f"Folder '{dir_path}' which declares a parent ID can't have a folder meta as it's handled by the parent folder"
+    def pump(self, budget_ms: float = 4) -> bool:
+        if self._finished:
+            return True
+        start = time.perf_counter()
+        while budget_ms is None or (time.perf_counter() - start) * 1000 < budget_ms:
+            try:
+                item = self._queue.get(block=budget_ms is None)
+            except queue.Empty:
+                break
+            if item is None:
+                self._finished = True
+                if self._error is not None:
+                    raise self._error
+                self._ctx.finish_load()
+                if self._refresh:
+                    self._ctx.run_refresh_callbacks(self._ctx.get_changes(self._states))
+                break
+            if self.total is None:
+                self._start_jobs(item)
+                continue
+            (asset, settings, sheet_settings), decoded = item
+            asset.load_resolved(
+                settings, sheet_settings, decoded, cached=decoded is None
             )
-        if parent_id is not None:
-            parent_dir = parent_folders[parent_id]
-            for ap in asset_pairs:
-                ap.folder_name = parent_dir.folder_name
-            parent_dir.add_pairs(asset_pairs)
+            self.loaded += 1
+            self.loaded_bytes += asset.fingerprint[1]
+            self.last_loaded = f"{asset.folder_name}/{asset.asset_name}"
+        return self._finished
+
+    def _start_jobs(self, prepared):
+        try:
+            pending = self._ctx.scan_load(*self._previous, prepared)
+            jobs = []
+            for job in pending:
+                size = job[0].get_decode_size(*job[1:])
+                jobs.append((job, size, not job[0].has_raw_surface(job[1], size)))
+            if self._ctx.uses_process_pool(pending):
+                self._processes = self._ctx.get_process_pool()
+        except BaseException:
+            self._finished = True
+            self._jobs.put(None)
+            raise
+        self.total_bytes = sum(asset.fingerprint[1] for asset, _, _ in pending)
+        self.total = len(pending)
+        self._jobs.put(jobs)
+
+    def wait(self) -> "LoadHandle":
+        self.pump(None)
+        return self
+
+    def done(self) -> bool:
+        return self._finished
+
+    def progress(self) -> float:
+        if not self.total:
+            return float(self._finished)
+        return self.loaded / self.total
+
+
+class Loader:
+    def __init__(self):
+        self._ctx = _Context(self)
+
+    def register_refresh(self, callback: typing.Callable, with_changes: bool = False):
+        self._ctx.refresh_callbacks.append((callback, with_changes))
+
+    def register_stats(self, callback: typing.Callable):
+        self._ctx.stats_callbacks.append(callback)
+
+    def set_stats(self, enabled: bool = True, slowest: int = 10):
+        self._ctx.stats = self._ctx.Stats(self._ctx, slowest) if enabled else None
+
+    def get_stats(self) -> dict:
+        if self._ctx.stats is None:
+            return self._ctx.Stats(self._ctx, 0).report()
+        return self._ctx.stats.report()
+
+    def reset_stats(self):
+        if self._ctx.stats is not None:
+            self._ctx.stats = self._ctx.Stats(self._ctx, self._ctx.stats.slowest)
+
+    def get(self, name: str, default=RuntimeError) -> Image:
+        if name in self._ctx.images:
+            return self._ctx.touch(self._ctx.images[name])
+        if isinstance(default, type) and issubclass(default, Exception):
+            raise default(f"Image '{name}' does not exist")
+        return default
+
+    def gets(self, *names: str, default=RuntimeError) -> list[Image]:
+        return [self.get(name, default) for name in names]
+
+    def get_from(self, folder: str, *names: str, default=RuntimeError) -> list[Image]:
+        return [self.get(f"{folder}/{name}", default) for name in names]
+
+    def get_all(self, folder: str, default=RuntimeError) -> list[Image]:
+        if folder in self._ctx.folder_images:
+            return [
+                self.get(f"{folder}/{name}", default)
+                for name in self._ctx.folder_images[folder]
+            ]
+        if isinstance(default, type) and issubclass(default, Exception):
+            raise default(f"Folder '{folder}' does not exist")
+        return default
+
+    def get_sheet(
+        self, name: str, default=RuntimeError
+    ) -> dict[tuple[int, int], Image]:
+        if name in self._ctx.sheets:
+            return {
+                pos: self.get(f"{name}({pos[0]},{pos[1]})", default)
+                for pos in self._ctx.sheets[name]
+            }
+        if isinstance(default, type) and issubclass(default, Exception):
+            raise default(f"Sheet '{name}' does not exist")
+        return default
+
+    def get_sheet_frames(self, name: str, default=RuntimeError) -> list[list[Image]]:
+        if name in self._ctx.sheet_frames:
+            frames = self._ctx.sheet_frames[name]
+            if len(frames) > 0 and len(frames[0]) > 0:
+                self.get(f"{name}(0,0)", default)
+            return [list(row) for row in frames]
+        if isinstance(default, type) and issubclass(default, Exception):
+            raise default(f"Sheet '{name}' does not exist")
+        return default
+
+    def get_folder_view(self, folder: str, default=RuntimeError) -> FolderView:
+        if folder in self._ctx.folder_views:
+            return self._ctx.folder_views[folder]
+        if folder in self._ctx.folder_images:
+            return self._ctx.folder_views.setdefault(
+                folder, FolderView(self._ctx, folder)
+            )
+        if isinstance(default, type) and issubclass(default, Exception):
+            raise default(f"Folder '{folder}' does not exist")
+        return default
+
+    def get_sheet_view(self, name: str, default=RuntimeError) -> SheetView:
+        if name in self._ctx.sheet_views:
+            return self._ctx.sheet_views[name]
+        if name in self._ctx.sheet_frames:
+            return self._ctx.sheet_views.setdefault(name, SheetView(self._ctx, name))
+        if isinstance(default, type) and issubclass(default, Exception):
+            raise default(f"Sheet '{name}' does not exist")
+        return default
+
+    def get_handle(self, name: str, default=RuntimeError) -> int:
+        if name in self._ctx.handle_ids:
+            return self._ctx.handle_ids[name]
+        if name in self._ctx.images:
+            self._ctx.handle_ids[name] = len(self._ctx.handle_names)
+            self._ctx.handle_names.append(name)
+            self._ctx.handle_version = None
+            return self._ctx.handle_ids[name]
+        if isinstance(default, type) and issubclass(default, Exception):
+            raise default(f"Image '{name}' does not exist")
+        return default
+
+    def get_by_handle(self, handle: int, default=RuntimeError) -> Image:
+        self._ctx.sync_handles()
+        if 0 <= handle < len(self._ctx.handle_images):
+            image = self._ctx.handle_images[handle]
+            if image is not None:
+                return self._ctx.touch(image)
+        if isinstance(default, type) and issubclass(default, Exception):
+            raise default(f"Image handle {handle} does not exist")
+        return default
+
+    def exists(self, *names: str) -> bool:
+        return all([name in self._ctx.images for name in names])
+
+    def exists_folder(self, *folders: str) -> bool:
+        return all([name in self._ctx.folder_images for name in folders])
+
+    def exists_sheet(self, *sheets: str) -> bool:
+        return all([name in self._ctx.sheets for name in sheets])
+
+    def sheet_has(self, sheet: str, *coordinates: tuple[int, int]):
+        return self.exists_sheet(sheet) and all(
+            [self.exists(f"{sheet}({c[0]},{c[1]})") for c in coordinates]
+        )
+
+    def set_unit(self, unit: float):
+        unit = float(unit)
+        self._ctx.unit = unit
+
+    def set_scale_cache_size(self, size: int):
+        self._ctx.scale_cache_size = int(size)
+        self._ctx.trim_scale_cache()
+
+    def get_unit(self) -> float:
+        if self._ctx.unit is None:
+            raise LoadError("Unit was not set")
+        return self._ctx.unit
+
+    def default_settings(
+        self,
+        alpha: bool | str = None,
+        size: tuple[int, int] = None,
+        scale: float | tuple[float, float] = None,
+        unit_size: tuple[float, float] = None,
+        colorkey: str | list[int] | int | pygame.Color = None,
+        global_alpha: int = None,
+        smoothscale: bool = None,
+        pyramid: bool = None,
+    ):
+        self._ctx.default_settings = pgloadermeta._meta._MetaSettings(
+            alpha, size, scale, unit_size, colorkey, global_alpha, smoothscale, pyramid
+        )
+
+    def load(
+        self,
+        folder: str,
+        unit: float = None,
+        workers: int = None,
+        hash_files: bool = False,
+        lazy: bool = False,
+        cache_dir: str = None,
+        cache_size: int = 512 * 1024 * 1024,
+        atlas: bool = False,
+        manifest: str = None,
+        processes: int = None,
+        dedup: bool = False,
+    ):
+        previous = self._ctx.start_load(
+            folder,
+            unit,
+            workers,
+            hash_files,
+            lazy,
+            cache_dir,
+            cache_size,
+            atlas,
+            manifest,
+            processes,
+            dedup,
+        )
+        self._ctx.load_assets(self._ctx.scan_load(*previous))
+        self._ctx.finish_load()
+
+    def load_async(
+        self,
+        folder: str,
+        unit: float = None,
+        workers: int = None,
+        hash_files: bool = False,
+        lazy: bool = False,
+        cache_dir: str = None,
+        cache_size: int = 512 * 1024 * 1024,
+        atlas: bool = False,
+        manifest: str = None,
+        processes: int = None,
+        dedup: bool = False,
+    ) -> "LoadHandle":
+        previous = self._ctx.start_load(
+            folder,
+            unit,
+            workers,
+            hash_files,
+            lazy,
+            cache_dir,
+            cache_size,
+            atlas,
+            manifest,
+            processes,
+            dedup,
+        )
+        return LoadHandle(self._ctx, previous)
+
+    def preload(self, *names: str):
+        pending = [
+            (asset, *asset.pending)
+            for asset in self._ctx.get_assets(names)
+            if asset.pending is not None
+        ]
+        self._ctx.load_assets(pending)
+        if self._ctx.atlas:
+            self._ctx.pack_atlases()
+
+    def evict(self, *names: str):
+        for asset in self._ctx.get_assets(names):
+            asset.evict()
+
+    def set_memory_budget(self, budget: int = None, drop_raw: bool = False):
+        self._ctx.memory_budget = int(budget) if budget is not None else None
+        self._ctx.drop_raw = drop_raw
+        self._ctx.memory_usage.clear()
+        self._ctx.memory_bytes = 0
+        for folder in self._ctx.folders:
+            for asset in folder.asset_pairs:
+                if asset.pending is None:
+                    self._ctx.track_memory(asset)
+
+    def get_memory_usage(self) -> dict[str, int | dict[str, int]]:
+        folders, sheets = {}, {}
+        for folder in self._ctx.folders:
+            size = sum(self._ctx.get_surface_bytes(atlas) for atlas in folder.atlases)
+            for asset in folder.asset_pairs:
+                asset_size = asset.get_memory()
+                if asset.is_sheet:
+                    sheets[f"{asset.folder_name}/{asset.asset_name}"] = asset_size
+                size += asset_size
+            folders[folder.folder_name] = size
+        return {"total": sum(folders.values()), "folders": folders, "sheets": sheets}
+
+    def watch(
+        self, interval: float = 0.5, debounce: float = 0.2, background: bool = True
+    ):
+        if self._ctx.load_folder is None:
+            raise LoadError("Cannot watch without loading once")
+        if self._ctx.pack is not None:
+            raise LoadError("Cannot watch a pack")
+        self.unwatch()
+        self._ctx.watcher = self._ctx.Watcher(
+            self._ctx.load_folder, interval, debounce, background
+        )
+
+    def unwatch(self):
+        if self._ctx.watcher is not None:
+            self._ctx.watcher.stop()
+            self._ctx.watcher = None
+
+    def poll(self) -> set[str]:
+        if self._ctx.load_folder is None:
+            raise LoadError("Cannot poll without loading once")
+        watcher = self._ctx.watcher
+        if watcher is None:
+            self.watch(background=False)
+        elif watcher.folder != self._ctx.load_folder:
+            self.watch(watcher.interval, watcher.debounce, watcher.thread is not None)
+        paths = self._ctx.watcher.take()
+        if paths is None:
+            return set()
+        return self._ctx.apply_changes(paths)
+
+    def shutdown_processes(self):
+        if self._ctx.process_pool is not None:
+            self._ctx.process_pool.shutdown(cancel_futures=True)
+            self._ctx.process_pool, self._ctx.process_pool_size = None, None
+
+    def pack(self, folder: str, path: str):
+        if not os.path.isdir(folder):
+            raise LoadError("Folder does not exist")
+        self._ctx.Pack.write(self._ctx, folder, path)
+
+    def write_manifest(self, path: str, folder: str = None):
+        folder = folder if folder is not None else self._ctx.load_folder
+        if folder is None:
+            raise LoadError("Cannot write a manifest without a folder")
+        if not os.path.exists(folder):
+            raise LoadError("Folder does not exist")
+        folders = []
+        for dir_path, dir_files, parent_ids in self._ctx.scan_folder(folder):
+            rel_path = os.path.relpath(dir_path, folder).replace("\\", "/")
+            folders.append(["" if rel_path == "." else rel_path, dir_files, parent_ids])
+        with open(path, "w") as file:
+            json.dump({"version": self._ctx.MANIFEST_VERSION, "folders": folders}, file)
+
+    def get_atlas_stats(self) -> dict[str, dict]:
+        return {
+            folder.folder_name: folder.atlas_stats
+            for folder in self._ctx.folders
+            if folder.atlas_stats is not None
+        }
+
+    def set_streamable(self, *folders: str):
+        self._ctx.streamable = set(
+            folder.replace("\\", "/").strip("/") for folder in folders
+        )
+
+    def load_folder(self, *folders: str):
+        pending = []
+        for folder in self._ctx.get_stream_folders(folders):
+            if folder.active:
+                continue
+            folder.active, folder.streamed_in = True, True
+            pending.extend(folder.get_pending())
+        self._ctx.folders = [
+            folder for folder in self._ctx.all_folders if folder.active
+        ]
+        self._ctx.load_assets(pending)
+        self._ctx.finish_load()
+
+    def unload_folder(self, *folders: str):
+        stream_folders = self._ctx.get_stream_folders(folders)
+        for folder in stream_folders:
+            if not self._ctx.is_streamable(folder.folder_path):
+                raise LoadError(
+                    f"Folder '{folder.folder_path}' is resident, mark it as streamable to unload it"
+                )
+        for folder in stream_folders:
+            folder.unload()
+        self._ctx.folders = [
+            folder for folder in self._ctx.all_folders if folder.active
+        ]
+        self._ctx.finish_load()
+
+    def clear_meta_cache(self, *paths: str):
+        if len(paths) == 0:
+            self._ctx.meta_cache.clear()
+        for path in paths:
+            self._ctx.meta_cache.pop(path.replace("\\", "/"), None)
+
+    def reload(self, unit: float = None):
+        if unit is not None:
+            self.set_unit(unit)
+        if self._ctx.load_folder is None:
+            raise LoadError("Cannot reload without loading once")
+
+        previous = self._ctx.get_states()
+        self.load(self._ctx.load_folder, **self._ctx.get_load_options())
+        self._ctx.run_refresh_callbacks(self._ctx.get_changes(previous))
+
+    def reload_async(self, unit: float = None) -> "LoadHandle":
+        if unit is not None:
+            self.set_unit(unit)
+        if self._ctx.load_folder is None:
+            raise LoadError("Cannot reload without loading once")
+
+        states = self._ctx.get_states()
+        previous = self._ctx.start_load(
+            self._ctx.load_folder, None, **self._ctx.get_load_options()
+        )
+        return LoadHandle(self._ctx, previous, True, states)
+
+    def refresh(self, unit: float = None):
+        if unit is not None:
+            self.set_unit(unit)
+        if self._ctx.refresh_jobs is not None:
+            # the scheduled refresh is done here, report its changes too
+            previous = self._ctx.refresh_states
+            self._ctx.refresh_jobs, self._ctx.refresh_states = None, None
         else:
-            asset_folder = _ctx.FolderMeta(dir_path, has_meta, asset_pairs)
-            if registered_id:
-                parent_folders[registered_id] = asset_folder
-            pending_folders.append(asset_folder)
-
-    _ctx.folders = []
-    for folder in pending_folders:
-        if len(folder.asset_pairs) > 0:
-            _ctx.folders.append(folder)
-
-    for folder in _ctx.folders:
-        folder.load()
-
-
-def reload(unit: float = None):
-    if unit is not None:
-        set_unit(unit)
-    if _ctx.load_folder is None:
-        raise LoadError("Cannot reload without loading once")
-
-    load(_ctx.load_folder)
-    for func in _ctx.refresh_callbacks:
-        func()
-
-
-def refresh(unit: float = None):
-    if unit is not None:
-        set_unit(unit)
-    _ctx.meta_storage.reset()
-    for folder in _ctx.folders:
-        folder.load()
-    for func in _ctx.refresh_callbacks:
-        func()
+            previous = self._ctx.get_states()
+        for folder in self._ctx.folders:
+            folder.refresh()
+        if self._ctx.atlas:
+            self._ctx.pack_atlases()
+        self._ctx.run_refresh_callbacks(self._ctx.get_changes(previous))
+
+    def request_refresh(self, unit: float = None):
+        if unit is not None:
+            self.set_unit(unit)
+        if self._ctx.refresh_jobs is None:
+            self._ctx.refresh_states = self._ctx.get_states()
+            self._ctx.refresh_jobs = []
+        self._ctx.refresh_dirty = True
+
+    def pump_refresh(self, budget_ms: float = 4) -> bool:
+        if self._ctx.refresh_jobs is None:
+            return True
+        start = time.perf_counter()
+        if self._ctx.refresh_dirty:
+            self._ctx.refresh_jobs = self._ctx.get_refresh_jobs()
+            self._ctx.refresh_dirty = False
+        while len(self._ctx.refresh_jobs) > 0 and (
+            budget_ms is None or (time.perf_counter() - start) * 1000 < budget_ms
+        ):
+            asset, settings, sheet_settings, state = self._ctx.refresh_jobs.pop()
+            if asset.state is None or asset.state == state:
+                continue
+            asset.state = state
+            if asset.pending is not None:
+                # evicted by an earlier job of this refresh
+                asset.defer(settings, sheet_settings)
+            else:
+                asset.load_resolved(settings, sheet_settings, cached=True)
+        if len(self._ctx.refresh_jobs) > 0:
+            return False
+        states = self._ctx.refresh_states
+        self._ctx.refresh_jobs, self._ctx.refresh_states = None, None
+        if self._ctx.atlas:
+            self._ctx.pack_atlases()
+        self._ctx.run_refresh_callbacks(self._ctx.get_changes(states))
+        return True
+
+
+_loader = Loader()
+register_refresh = _loader.register_refresh
+register_stats = _loader.register_stats
+set_stats = _loader.set_stats
+get_stats = _loader.get_stats
+reset_stats = _loader.reset_stats
+get = _loader.get
+gets = _loader.gets
+get_from = _loader.get_from
+get_all = _loader.get_all
+get_sheet = _loader.get_sheet
+get_sheet_frames = _loader.get_sheet_frames
+get_folder_view = _loader.get_folder_view
+get_sheet_view = _loader.get_sheet_view
+get_handle = _loader.get_handle
+get_by_handle = _loader.get_by_handle
+exists = _loader.exists
+exists_folder = _loader.exists_folder
+exists_sheet = _loader.exists_sheet
+sheet_has = _loader.sheet_has
+set_unit = _loader.set_unit
+set_scale_cache_size = _loader.set_scale_cache_size
+get_unit = _loader.get_unit
+default_settings = _loader.default_settings
+load = _loader.load
+load_async = _loader.load_async
+preload = _loader.preload
+evict = _loader.evict
+set_memory_budget = _loader.set_memory_budget
+get_memory_usage = _loader.get_memory_usage
+watch = _loader.watch
+unwatch = _loader.unwatch
+poll = _loader.poll
+shutdown_processes = _loader.shutdown_processes
+pack = _loader.pack
+write_manifest = _loader.write_manifest
+get_atlas_stats = _loader.get_atlas_stats
+set_streamable = _loader.set_streamable
+load_folder = _loader.load_folder
+unload_folder = _loader.unload_folder
+clear_meta_cache = _loader.clear_meta_cache
+reload = _loader.reload
+reload_async = _loader.reload_async
+refresh = _loader.refresh
+request_refresh = _loader.request_refresh
+pump_refresh = _loader.pump_refresh
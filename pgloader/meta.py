@@ -1,5 +1,6 @@
 import pygame
 import dataclasses
+import contextvars
 
 
 __all__ = (
@@ -35,13 +36,14 @@ class _meta:
 
     @dataclasses.dataclass
     class _MetaSettings:
-        alpha: bool = None
+        alpha: bool | str = None
         size: tuple[int, int] = None
         scale: float | tuple[float, float] = None
         unit_size: tuple[float, float] = None
         colorkey: str | list[int] | int | pygame.Color = None
         global_alpha: int = None
         smoothscale: bool = None
+        pyramid: bool = None
 
         def apply_default(self, s: "_meta._MetaSettings"):
             for attrname in [
@@ -52,6 +54,7 @@ class _meta:
                 "colorkey",
                 "global_alpha",
                 "smoothscale",
+                "pyramid",
             ]:
                 if getattr(self, attrname) is None and getattr(s, attrname) is not None:
                     setattr(self, attrname, getattr(s, attrname))
@@ -66,6 +69,7 @@ class _meta:
                 self.colorkey,
                 self.global_alpha,
                 self.smoothscale,
+                self.pyramid,
             )
 
     @dataclasses.dataclass
@@ -77,26 +81,30 @@ class _meta:
 
     @staticmethod
     def _store(name, data):
-        if getattr(_meta.__META_STORAGE__, name) is not None:
+        storage = _meta.__META_STORAGE__.get()
+        if getattr(storage, name) is not None:
             return
-        _meta.__META_STORAGE__.name = name
-        setattr(_meta.__META_STORAGE__, name, data)
+        storage.name = name
+        setattr(storage, name, data)
 
-    __META_STORAGE__ = _MetaStorage()
+    __META_STORAGE__ = contextvars.ContextVar(
+        "pgloader_meta_storage", default=_MetaStorage()
+    )
 
 
 def settings(
     *,
-    alpha: bool = None,
+    alpha: bool | str = None,
     size: tuple[int, int] = None,
     scale: float | tuple[float, float] = None,
     unit_size: tuple[float, float] = None,
     colorkey: str | list[int] | int | pygame.Color = None,
     global_alpha: int = None,
     smoothscale: bool = None,
+    pyramid: bool = None,
 ):
     s = _meta._MetaSettings(
-        alpha, size, scale, unit_size, colorkey, global_alpha, smoothscale
+        alpha, size, scale, unit_size, colorkey, global_alpha, smoothscale, pyramid
     )
     _meta._store("settings", s)
     return s
@@ -104,16 +112,17 @@ def settings(
 
 def default_settings(
     *,
-    alpha: bool = None,
+    alpha: bool | str = None,
     size: tuple[int, int] = None,
     scale: float | tuple[float, float] = None,
     unit_size: tuple[float, float] = None,
     colorkey: str | list[int] | int | pygame.Color = None,
     global_alpha: int = None,
     smoothscale: bool = None,
+    pyramid: bool = None,
 ):
     s = _meta._MetaSettings(
-        alpha, size, scale, unit_size, colorkey, global_alpha, smoothscale
+        alpha, size, scale, unit_size, colorkey, global_alpha, smoothscale, pyramid
     )
     _meta._store("default_settings", s)
     return s